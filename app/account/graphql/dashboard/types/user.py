@@ -7,6 +7,7 @@ import graphene
 
 from account.graphql.dashboard.types.profile import ProfileNode
 from account.models import User
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from tenant.models import Domain, Tenant
 
@@ -48,17 +49,19 @@ class UserNode(DjangoObjectType):
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return queryset.select_related("profile")
+        return queryset
 
     @classmethod
     def get_node(cls, info: ResolveInfo, id):
         return cls._meta.model.objects.filter(pk=id).first()
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_profile(root: User, info, **kwargs):
         return info.context.loaders.profile_by_user_loader.load(root.id)
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_tenants(root: User, info: ResolveInfo):
         with schema_context(settings.PUBLIC_SCHEMA_NAME):
             tenants = []
@@ -6,6 +6,7 @@ from graphene_django import DjangoObjectType
 import graphene
 
 from account.models import User
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from tenant.models import Domain, Tenant
 
@@ -43,13 +44,14 @@ class UserNode(DjangoObjectType):
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return queryset.select_related("profile")
+        return queryset
 
     @classmethod
     def get_node(cls, info: ResolveInfo, id):
         return cls._meta.model.objects.filter(pk=id).first()
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_tenants(root: User, info: ResolveInfo):
         with schema_context(settings.PUBLIC_SCHEMA_NAME):
             tenants = []
@@ -3,6 +3,7 @@ import uuid
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
+from django.utils.functional import cached_property
 
 from safedelete.models import SafeDeleteModel, SOFT_DELETE_CASCADE
 
@@ -42,41 +43,63 @@ class User(CommonDateAndSafeDeleteMixin, AbstractBaseUser):
     def __str__(self):
         return str(self.id)
 
+    @cached_property
+    def role_slugs(self) -> frozenset:
+        return frozenset(self.roles.values_list("slug", flat=True))
+
+    @cached_property
+    def permission_slugs(self) -> frozenset:
+        return frozenset(
+            self.roles.filter(
+                permissions__isnull=False, permissions__deleted__isnull=True
+            ).values_list("permissions__slug", flat=True)
+        )
+
+    def has_role(self, slug: str) -> bool:
+        return slug in self.role_slugs
+
+    def has_permission(self, slug: str) -> bool:
+        return slug in self.permission_slugs
+
+    def clear_role_cache(self) -> None:
+        self.__dict__.pop("role_slugs", None)
+        self.__dict__.pop("permission_slugs", None)
+
     @property
     def is_hq_user(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.HQUser).exists()
+        return self.has_role(ProtectedRole.HQUser)
 
     @property
     def is_admin(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Admin).exists()
+        return self.has_role(ProtectedRole.Admin)
 
     @property
     def is_collaborator(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Collaborator).exists()
+        return self.has_role(ProtectedRole.Collaborator)
 
     @property
     def is_customer(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Customer).exists()
+        return self.has_role(ProtectedRole.Customer)
 
     @property
     def is_manager(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Manager).exists()
+        return self.has_role(ProtectedRole.Manager)
 
     @property
     def is_member(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Member).exists()
+        return self.has_role(ProtectedRole.Member)
 
     @property
     def is_owner(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Owner).exists()
+        return self.has_role(ProtectedRole.Owner)
 
     @property
     def is_partner(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Partner).exists()
+        return self.has_role(ProtectedRole.Partner)
 
     @property
     def is_staff(self) -> bool:
-        return self.roles.filter(slug=ProtectedRole.Staff).exists()
+        return self.has_role(ProtectedRole.Staff)
 
 
 class Profile(SafeDeleteModel):
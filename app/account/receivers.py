@@ -1,19 +1,80 @@
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
 
 from graphene import ResolveInfo
 
 from account.models import User
 from account.signals import signin_fail, signin_success
-from log.models import Log
+from core.graphql_jwt.cache import invalidate_user_snapshots_on_commit
+from log.helpers.audit_helper import audit_log_writer
+from role.models import Role
 
 
 @receiver(signin_fail)
 def signin_fail(sender, info: ResolveInfo, user: User, **kwargs):
-    Log.objects.create(action="signin_fail", user=user)
-    print(sender, user.id)
+    audit_log_writer.write(
+        schema_name=connection.schema_name,
+        user_id=user.id,
+        action="signin_fail",
+        ip=getattr(info.context, "user_ip", None),
+        location=getattr(info.context, "user_location", None),
+    )
 
 
 @receiver(signin_success)
 def signin_success(sender, info: ResolveInfo, user: User, **kwargs):
-    Log.objects.create(action="signin_success", user=user)
-    print(sender, user.id)
+    audit_log_writer.write(
+        schema_name=connection.schema_name,
+        user_id=user.id,
+        action="signin_success",
+        ip=getattr(info.context, "user_ip", None),
+        location=getattr(info.context, "user_location", None),
+    )
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def user_roles_changed(sender, instance, action: str, pk_set=None, **kwargs):
+    if isinstance(instance, User):
+        instance.clear_role_cache()
+        if action.startswith("post_"):
+            invalidate_user_snapshots_on_commit([(instance.endpoint, instance.email)])
+    elif action in ("post_add", "post_remove") and pk_set:
+        invalidate_user_snapshots_on_commit(
+            User.objects.filter(pk__in=pk_set).values_list("endpoint", "email")
+        )
+    elif action == "pre_clear":
+        invalidate_user_snapshots_on_commit(
+            instance.user_set.values_list("endpoint", "email")
+        )
+
+
+@receiver(post_init, sender=User)
+def remember_user_identity(sender, instance: User, **kwargs):
+    instance._original_identity = (
+        instance.__dict__.get("endpoint"),
+        instance.__dict__.get("email"),
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance: User, **kwargs):
+    identities = {(instance.endpoint, instance.email)}
+    endpoint, email = instance._original_identity
+    if email is not None:
+        identities.add((endpoint, email))
+    invalidate_user_snapshots_on_commit(identities)
+
+    instance._original_identity = (instance.endpoint, instance.email)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def role_changed(sender, instance: Role, created: bool = False, **kwargs):
+    if created:
+        return
+
+    invalidate_user_snapshots_on_commit(
+        instance.user_set.values_list("endpoint", "email")
+    )
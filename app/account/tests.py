@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from django_tenants.test.cases import TenantTestCase
+
+from account.models import User
+from account.receivers import role_changed
+from core.graphql_jwt.cache import CACHE_KEY_PREFIX, _get_identity
+from organization.models import Organization
+from role.models import Role
+
+
+class UserSnapshotInvalidationTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        # TenantTestCase skips the class level override_settings
+        settings_override = self.settings(
+            JWT_USER_CACHE={"enabled": True, "timeout": 300}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        organization = Organization.objects.create(schema_name=self.tenant.schema_name)
+        self.role = Role.objects.create(organization=organization, slug="staff")
+        self.user = User.objects.create(
+            endpoint="dashboard", email="user@example.com", username="user"
+        )
+        cache.clear()
+
+    def get_generation(self) -> int:
+        identity = _get_identity("dashboard", "user@example.com")
+
+        return cache.get(f"{CACHE_KEY_PREFIX}:{identity}:generation", 0)
+
+    def test_role_assignment_is_invalidated_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.roles.add(self.role)
+
+            self.assertEqual(self.get_generation(), 0)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.get_generation(), 1)
+
+    def test_role_change_is_invalidated_on_commit(self):
+        self.user.roles.add(self.role)
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.role.slug = "manager"
+            self.role.save()
+
+            self.assertEqual(self.get_generation(), 0)
+
+        self.assertEqual(self.get_generation(), 1)
+
+    @override_settings(JWT_USER_CACHE={"enabled": False, "timeout": 300})
+    def test_role_change_does_not_query_users_when_the_cache_is_disabled(self):
+        self.user.roles.add(self.role)
+
+        with self.assertNumQueries(0):
+            role_changed(Role, instance=self.role)
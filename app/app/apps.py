@@ -5,7 +5,18 @@ class MyAppConfig(AppConfig):
     name = "app"
 
     def ready(self):
-        from account import receivers
+        from account import receivers as account_receivers
+        from tenant import receivers as tenant_receivers
 
-        receivers.signin_fail
-        receivers.signin_success
+        account_receivers.remember_user_identity
+        account_receivers.role_changed
+        account_receivers.signin_fail
+        account_receivers.signin_success
+        account_receivers.user_changed
+        account_receivers.user_roles_changed
+        tenant_receivers.cors_allow_domain_origin
+        tenant_receivers.invalidate_contract_cache
+        tenant_receivers.invalidate_domain_cache
+        tenant_receivers.remember_domain_origin
+        tenant_receivers.remove_domain_origin
+        tenant_receivers.update_domain_origin
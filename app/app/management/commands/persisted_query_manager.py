@@ -0,0 +1,64 @@
+from pathlib import Path
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from graphql import GraphQLError, parse
+
+from core.helpers.persisted_query_helper import get_query_hash
+
+
+class Command(BaseCommand):
+    help = "Persisted Query Manager"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-b",
+            "--build",
+            action="store_true",
+            help="Build the registry from .graphql files.",
+        )
+
+        parser.add_argument(
+            "--source",
+            help="Specify a directory of .graphql files.",
+        )
+        parser.add_argument(
+            "--output",
+            default=settings.GRAPHENE_PERSISTED_QUERIES["registry"],
+            help="Specify the registry file.",
+        )
+
+    def handle(self, *args, **options):
+        if options.get("b") or options.get("build"):
+            if options.get("source"):
+                source = Path(options.get("source"))
+                output = options.get("output")
+
+                registry = {}
+                for path in sorted(source.rglob("*.graphql")):
+                    query = path.read_text(encoding="utf-8")
+                    try:
+                        parse(query)
+                    except GraphQLError as e:
+                        self.stdout.write(self.style.ERROR(f"{path}: {e.message}"))
+                        return
+
+                    registry[get_query_hash(query)] = query
+
+                with open(output, "w", encoding="utf-8") as f:
+                    json.dump(registry, f, indent=4)
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Successfully build a registry with {len(registry)} queries!"
+                    )
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR("Please provide the correct option.")
+                )
+
+        else:
+            self.stdout.write(self.style.ERROR("Please provide the correct option."))
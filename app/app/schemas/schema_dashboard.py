@@ -7,6 +7,7 @@ from account.graphql.schema_dashboard import (
     Mutation as AccountMutation,
     Query as AccountQuery,
 )
+from log.graphql.schema_dashboard import Query as LogQuery
 from organization.graphql.schema_dashboard import (
     Mutation as OrganizationMutation,
     Query as OrganizationQuery,
@@ -30,6 +31,7 @@ class Mutation(
 
 class Query(
     AccountQuery,
+    LogQuery,
     OrganizationQuery,
     RoleQuery,
     TenantQuery,
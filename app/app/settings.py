@@ -28,11 +28,21 @@ django.utils.encoding.force_text = force_str
 env = environ.Env(
     APP_CSRF_VIEW_MIDDLEWARE=(bool, True),
     DEBUG=(bool, False),
+    GRAPHENE_OPTIMIZER_REPORT=(bool, False),
+    GRAPHQL_LOG_SAMPLE_RATE=(float, 1.0),
+    GRAPHQL_LOG_VERBOSE=(bool, False),
     JWT_EXPIRATION_MINUTES=(int, 60),
     JWT_REFRESH_EXPIRATION_DAYS=(int, 7),
     JWT_REVOKE_AND_REFRESH=(bool, True),
+    JWT_USER_CACHE_ENABLED=(bool, False),
+    PERSISTED_QUERIES_ALLOW_LIST=(bool, False),
     PLAYGROUND=(bool, True),
+    RECAPTCHA_BACKEND=(str, "core.helpers.captcha_helper.GoogleRecaptcha3Backend"),
+    RECAPTCHA_CONCURRENT=(bool, False),
     RECAPTCHA_ENABLED=(bool, True),
+    TENANT_POOL_ENABLED=(bool, False),
+    TENANT_POOL_SIZE=(int, 10),
+    TENANT_PROVISIONING_STRATEGY=(str, "migrate"),
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -116,6 +126,26 @@ TENANT_DOMAIN_MODEL = "tenant.Domain"
 
 TENANT_MODEL = "tenant.Tenant"
 
+# strategy: "migrate" runs every migration in the new schema,
+#           "clone" copies template_schema (kept current by schema_manager --sync)
+TENANT_PROVISIONING = {
+    "strategy": env("TENANT_PROVISIONING_STRATEGY"),
+    "template_schema": "tenant_template",
+}
+
+# Jobs with schema_name "*" run their handler in every tenant schema
+# using a pool of fanout_workers threads
+SCHEDULER = {
+    "fanout_workers": 8,
+}
+
+# Pre-provisioned schemas claimed by TenantService.create_tenant,
+# topped up to size by schema_manager --fill
+TENANT_POOL = {
+    "enabled": env("TENANT_POOL_ENABLED"),
+    "size": env("TENANT_POOL_SIZE"),
+}
+
 INSTALLED_APPS = list(SHARED_APPS) + [
     app for app in TENANT_APPS if app not in SHARED_APPS
 ]
@@ -138,7 +168,6 @@ ALLOWED_HOSTS = env("ALLOWED_HOSTS").split(" ")
 # https://docs.djangoproject.com/en/4.2/topics/http/middleware/
 
 MIDDLEWARE = [
-    "core.middleware.DomainCorsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django_ip_geolocation.middleware.IpGeolocationMiddleware",
     "core.middleware.DepthCheckMiddleware",
@@ -155,7 +184,7 @@ MIDDLEWARE = [
 
 if APP_CSRF_VIEW_MIDDLEWARE:
     index = MIDDLEWARE.index("django.middleware.common.CommonMiddleware")
-    MIDDLEWARE.insert(index + 1, "django.middleware.csrf.CsrfViewMiddleware")
+    MIDDLEWARE.insert(index + 1, "core.middleware.DomainCsrfViewMiddleware")
 
 
 # django-ipware
@@ -176,6 +205,27 @@ IPWARE_META_PRECEDENCE_ORDER = (
 )
 
 
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "core": {
+            "handlers": ["console"],
+            "level": "DEBUG" if DEBUG else "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
@@ -208,6 +258,27 @@ IP_GEOLOCATION_SETTINGS = {
 }
 
 
+# IP location used by HeaderHandlerMiddleware for request.user_location
+# BACKEND: core.helpers.ip_helper.IPAPIBackend (HTTP) or
+#          core.helpers.ip_helper.GeoIP2Backend (local .mmdb, needs geoip2)
+
+IP_LOCATION = {
+    "BACKEND": "core.helpers.ip_helper.IPAPIBackend",
+    "OPTIONS": {
+        "endpoint": "https://ipapi.co/{ip}/json/",
+        "timeout": 0.5,
+    },
+    # Locations are cached per network prefix
+    "CACHE": {
+        "maxsize": 10000,
+        "prefix_length_v4": 24,
+        "prefix_length_v6": 48,
+        "timeout": 60 * 60 * 24,
+        "timeout_failure": 60,
+    },
+}
+
+
 # Cache
 # https://docs.djangoproject.com/en/4.2/topics/cache/
 # https://django-tenants.readthedocs.io/en/latest/install.html#caching
@@ -239,6 +310,20 @@ else:
         }
     }
 
+# Contract validity periods used by within_validity_period
+CONTRACT_VALIDITY_CACHE = {
+    "maxsize": 1024,
+    "timeout_local": 30,
+    "timeout_shared": 300,
+}
+
+# Domain to tenant resolution used by XTenantMiddleware
+TENANT_DOMAIN_CACHE = {
+    "maxsize": 1024,
+    "timeout_local": 30,
+    "timeout_shared": 300,
+}
+
 
 # CORS
 # https://pypi.org/project/django-cors-headers/
@@ -329,8 +414,6 @@ GRAPHENE = {
     "MIDDLEWARE": [
         "core.sentry.middleware.SentryMiddleware",
         "core.graphql_jwt.middleware.JSONWebTokenMiddleware",
-        "account.graphql.middleware.LoaderMiddleware",
-        "tenant.graphql.middleware.LoaderMiddleware",
     ],
     # Set to True if the connection fields must have
     # either the first or last argument
@@ -343,9 +426,65 @@ GRAPHENE = {
     "TESTING_ENDPOINT": "/graphql",
 }
 
+GRAPHENE_DOCUMENT_CACHE_SIZE = 512
 GRAPHENE_MAX_BREADTH = 1
 GRAPHENE_MAX_DEPTH = 18
 
+# Query plans built by core.optimizer are logged at DEBUG level and added to
+# the verbose request dump. Independent of DEBUG, which is toggled per request.
+GRAPHENE_OPTIMIZER = {
+    "report": env("GRAPHENE_OPTIMIZER_REPORT"),
+}
+
+# estimatedCount on connections: planner estimates above the threshold are
+# returned as is, smaller counts are counted exactly and cached.
+TOTAL_COUNT = {
+    "threshold": 10000,
+    "timeout": 60 * 5,
+}
+
+# Structured request log written once per GraphQL request.
+# Failed requests are always logged, successful ones are sampled.
+# Verbose dumps (headers, query, variables, result) are logged at DEBUG
+# level with credentials redacted.
+GRAPHENE_REQUEST_LOGGER = {
+    "BACKEND": "core.loggers.GraphQLRequestLogger",
+    "OPTIONS": {
+        "sample_rate": env("GRAPHQL_LOG_SAMPLE_RATE"),
+        "verbose": env("GRAPHQL_LOG_VERBOSE"),
+    },
+}
+
+# Buffered audit logs written to log.Log / LogDetail in the background.
+# Set GRAPHENE_REQUEST_LOGGER["BACKEND"] to
+# "log.loggers.AuditGraphQLRequestLogger" to audit authenticated requests.
+AUDIT_LOG = {
+    "max_size": 10000,
+    "batch_size": 500,
+    "flush_interval": 1.0,
+    # Batches that can not be written go here, see log_manager --replay
+    "fallback_path": BASE_DIR / "audit_log_fallback.jsonl",
+}
+
+# Log and LogDetail are partitioned by month on created_at. Run
+# log_manager --partition / --retention, or a "*" Job with the
+# log_partition_maintenance slug, to roll partitions.
+LOG_PARTITIONS = {
+    "months_ahead": 3,
+    "retention_months": 12,
+}
+
+# Persisted queries and Automatic Persisted Queries (APQ)
+# https://www.apollographql.com/docs/apollo-server/performance/apq/
+GRAPHENE_PERSISTED_QUERIES = {
+    "enabled": True,
+    # Only accept queries found in the registry
+    "allow_list": env("PERSISTED_QUERIES_ALLOW_LIST"),
+    # JSON object of sha256 hash to query, built at deploy time
+    "registry": os.path.join(BASE_DIR, "persisted_queries.json"),
+    "timeout": 60 * 60 * 24,
+}
+
 # GRAPHQL_JWT = {
 #     "JWT_ALGORITHM": "HS256",
 #     "JWT_ALLOW_REFRESH": True,
@@ -390,6 +529,13 @@ GRAPHQL_JWT = {
     "JWT_VERIFY_EXPIRATION": True,
 }
 
+# Verified token to user snapshot cache, invalidated on user/role changes
+# and refresh token revocation. Entries never outlive the token's exp.
+JWT_USER_CACHE = {
+    "enabled": env("JWT_USER_CACHE_ENABLED"),
+    "timeout": 300,
+}
+
 
 # Authentication
 # https://docs.djangoproject.com/en/4.2/topics/auth/
@@ -529,6 +675,11 @@ CAPTCHA = {
     # https://cloud.google.com/recaptcha-enterprise/docs/compare-versions
     "google_recaptcha3": {
         "enabled": env("RECAPTCHA_ENABLED"),
+        # core.helpers.captcha_helper.StubBackend verifies offline
+        "backend": env("RECAPTCHA_BACKEND"),
+        # Verify in a worker thread while the mutation runs, only for
+        # mutations decorated with google_captcha3(action, concurrent=True)
+        "concurrent": env("RECAPTCHA_CONCURRENT"),
         "key_public": env("RECAPTCHA_PUBLIC_KEY"),
         "key_private": env("RECAPTCHA_PRIVATE_KEY"),
         "endpoint": "https://www.google.com/recaptcha/api/siteverify",
@@ -537,6 +688,9 @@ CAPTCHA = {
             "default": 0.5,
         },
         "timeout": 2,
+        # Verified tokens are rejected when replayed within this window
+        "replay_timeout": 120,
+        "workers": 8,
     },
 }
 
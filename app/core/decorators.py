@@ -1,51 +1,43 @@
 from functools import wraps
-import requests
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import connection
+from django.db import connection, transaction
 from django.utils.translation import gettext as _
 
+from core.helpers.captcha_helper import get_captcha_helper
 from tenant.helpers.contract_helper import ContractHelper
 
 
-def google_captcha3(action):
+def google_captcha3(action, concurrent: bool = False):
+    # Only mutations without side effects outside the database may pass
+    # concurrent=True, everything else waits for the verification result
     def decorator(func):
         @wraps(func)
         def wrapper(info, *args, **input):
-            if settings.CAPTCHA["google_recaptcha3"]["enabled"]:
-                data = {
-                    "secret": settings.CAPTCHA["google_recaptcha3"]["key_private"],
-                    "response": input["captcha"],
-                }
-                try:
-                    r = requests.post(
-                        settings.CAPTCHA["google_recaptcha3"]["endpoint"],
-                        data=data,
-                        timeout=settings.CAPTCHA["google_recaptcha3"]["timeout"],
-                    )
-                    res = r.json()
-
-                    threshold: float = settings.CAPTCHA["google_recaptcha3"][
-                        "threshold"
-                    ]["default"]
-                    if action in settings.CAPTCHA["google_recaptcha3"]["threshold"]:
-                        threshold: float = settings.CAPTCHA["google_recaptcha3"][
-                            "threshold"
-                        ][action]
-
-                    if not all(
-                        (
-                            res["success"],
-                            res["score"] > threshold,
-                            res["action"] == action,
-                        )
-                    ):
-                        raise ValidationError(_("Captcha Error!"))
-                except:
+            if not settings.CAPTCHA["google_recaptcha3"]["enabled"]:
+                return func(info, *args, **input)
+
+            captcha_helper = get_captcha_helper()
+
+            if not (concurrent and settings.CAPTCHA["google_recaptcha3"]["concurrent"]):
+                if not captcha_helper.verify(input.get("captcha"), action):
                     raise ValidationError(_("Captcha Error!"))
 
-            result = func(info, *args, **input)
+                return func(info, *args, **input)
+
+            # Verify while the mutation runs, rolling it back on failure
+            future = captcha_helper.verify_async(input.get("captcha"), action)
+            try:
+                with transaction.atomic():
+                    result = func(info, *args, **input)
+
+                    if not future.result():
+                        raise ValidationError(_("Captcha Error!"))
+            except Exception:
+                if not future.result():
+                    raise ValidationError(_("Captcha Error!"))
+                raise
 
             return result
 
@@ -0,0 +1,99 @@
+from calendar import timegm
+from datetime import datetime
+from hashlib import sha256
+from typing import Iterable, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from django_tenants.utils import schema_context
+
+CACHE_KEY_PREFIX = "jwt:user"
+
+
+def _get_identity(endpoint: str, email: str) -> str:
+    return sha256(f"{endpoint}:{email}".encode()).hexdigest()
+
+
+class UserSnapshotCache:
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.enabled = settings.JWT_USER_CACHE["enabled"]
+        identity = _get_identity(payload.get("endpoint"), payload.get("email"))
+        self.snapshot_key = f"{CACHE_KEY_PREFIX}:{identity}:{payload.get('origIat')}"
+        self.generation_key = f"{CACHE_KEY_PREFIX}:{identity}:generation"
+        self.generation = None
+
+    def get(self):
+        if not self.enabled:
+            return None
+
+        values = cache.get_many([self.snapshot_key, self.generation_key])
+        self.generation = values.get(self.generation_key, 0)
+        snapshot = values.get(self.snapshot_key)
+
+        if snapshot is None or snapshot["generation"] != self.generation:
+            return None
+
+        user = get_user_model().from_db(
+            "default",
+            ["id", "endpoint", "email"],
+            [snapshot["id"], snapshot["endpoint"], snapshot["email"]],
+        )
+        user.is_active = snapshot["is_active"]
+        user.__dict__["role_slugs"] = frozenset(snapshot["role_slugs"])
+
+        return user
+
+    def set(self, user) -> None:
+        if not self.enabled or self.generation is None:
+            return
+
+        timeout = settings.JWT_USER_CACHE["timeout"]
+        if exp := self.payload.get("exp"):
+            timeout = min(timeout, exp - timegm(datetime.utcnow().utctimetuple()))
+        if timeout <= 0:
+            return
+
+        cache.set(
+            self.snapshot_key,
+            {
+                "generation": self.generation,
+                "id": user.id,
+                "endpoint": user.endpoint,
+                "email": user.email,
+                "is_active": getattr(user, "is_active", True),
+                "role_slugs": list(user.role_slugs),
+            },
+            timeout,
+        )
+
+
+def invalidate_user_snapshot(endpoint: str, email: str) -> None:
+    if not settings.JWT_USER_CACHE["enabled"]:
+        return
+
+    generation_key = f"{CACHE_KEY_PREFIX}:{_get_identity(endpoint, email)}:generation"
+
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        cache.set(generation_key, 1, None)
+
+
+def invalidate_user_snapshots_on_commit(identities: Iterable[Tuple[str, str]]) -> None:
+    # Invalidated after commit, a snapshot rebuilt before it would keep old roles
+    if not settings.JWT_USER_CACHE["enabled"]:
+        return
+
+    identities = list(identities)
+    schema_name = connection.schema_name
+
+    def invalidate():
+        with schema_context(schema_name):
+            for endpoint, email in identities:
+                invalidate_user_snapshot(endpoint, email)
+
+    transaction.on_commit(invalidate)
@@ -12,6 +12,7 @@ from core.graphql_jwt.backends import JSONWebTokenBackend
 
 __all__ = [
     "allow_any",
+    "JSONWebTokenAuthentication",
     "JSONWebTokenMiddleware",
 ]
 
@@ -35,62 +36,107 @@ def _authenticate(request):
     return is_anonymous and get_http_authorization(request) is not None
 
 
-class JSONWebTokenMiddleware:
+class JSONWebTokenAuthentication:
     def __init__(self):
-        self.cached_allow_any = set()
+        self.user = None
+        self.attempted = False
+        self.authorized_user = None
+        self.authorization_error = None
+        self.token_users = PathDict()
+
+    @classmethod
+    def from_context(cls, context) -> "JSONWebTokenAuthentication":
+        authentication = getattr(context, "jwt_authentication", None)
+
+        if authentication is None:
+            authentication = cls()
+            context.jwt_authentication = authentication
+
+            if hasattr(context, "user"):
+                if hasattr(context, "session"):
+                    context.user = get_user(context)
+                else:
+                    context.user = AnonymousUser()
 
-        if jwt_settings.JWT_ALLOW_ARGUMENT:
-            self.cached_authentication = PathDict()
+        return authentication
+
+
+class JSONWebTokenMiddleware:
+    def __init__(self):
+        self.cached_allow_any = {}
 
     def authenticate_context(self, info, **kwargs):
-        root_path = info.path[0]
+        path = info.path.as_list()
+        key = (get_root_type(info).name, path[0])
 
-        if root_path not in self.cached_allow_any:
-            if jwt_settings.JWT_ALLOW_ANY_HANDLER(info, **kwargs):
-                self.cached_allow_any.add(root_path)
-            else:
+        if key not in self.cached_allow_any:
+            if len(path) > 1:
                 return True
-        return False
+            self.cached_allow_any[key] = bool(
+                jwt_settings.JWT_ALLOW_ANY_HANDLER(info, **kwargs)
+            )
+
+        return not self.cached_allow_any[key]
+
+    def get_authorization_error(self, context, user):
+        endpoint = context.path.split("/")[1]
+
+        if endpoint in ("dashboard", "hq"):
+            if user is None:
+                return "The token is invalid!"
+            elif not user.is_staff:
+                return "This operation is not allowed!"
+            elif endpoint == "hq":
+                if not user.is_hq_user:
+                    return "This operation is not allowed!"
+
+        return None
+
+    def authorize(self, context, authentication, user):
+        if authentication.authorized_user is not user or user is None:
+            authentication.authorized_user = user
+            authentication.authorization_error = self.get_authorization_error(
+                context, user
+            )
+
+        if authentication.authorization_error:
+            raise ValidationError(authentication.authorization_error)
 
     def resolve(self, next, root, info, **kwargs):
         context = info.context
+        authentication = JSONWebTokenAuthentication.from_context(context)
         token_argument = get_token_argument(context, **kwargs)
 
-        user = None
+        if token_argument is not None:
+            user = None
 
-        if jwt_settings.JWT_ALLOW_ARGUMENT and token_argument is None:
-            user = self.cached_authentication.parent(info.path)
+            if self.authenticate_context(info, **kwargs):
+                user = JSONWebTokenBackend().authenticate(request=context, **kwargs)
 
-            if user is not None:
-                context.user = user
-
-            elif hasattr(context, "user"):
-                if hasattr(context, "session"):
-                    context.user = get_user(context)
-                    self.cached_authentication.insert(info.path, context.user)
-                else:
-                    context.user = AnonymousUser()
-
-        if (
-            _authenticate(context) or token_argument is not None
-        ) and self.authenticate_context(info, **kwargs):
-            user = JSONWebTokenBackend().authenticate(request=context, **kwargs)
+                if user is not None:
+                    context.user = user
+                    authentication.token_users.insert(info.path.as_list(), user)
+        else:
+            user = authentication.token_users.parent(info.path.as_list())
 
             if user is not None:
                 context.user = user
-
-                if jwt_settings.JWT_ALLOW_ARGUMENT:
-                    self.cached_authentication.insert(info.path, user)
+            else:
+                if (
+                    not authentication.attempted
+                    and _authenticate(context)
+                    and self.authenticate_context(info, **kwargs)
+                ):
+                    authentication.user = JSONWebTokenBackend().authenticate(
+                        request=context, **kwargs
+                    )
+                    authentication.attempted = True
+
+                user = authentication.user
+                if user is not None:
+                    context.user = user
 
         if not settings.PLAYGROUND:
-            endpoint = info.context.path.split("/")[1]
-            if endpoint in ("dashboard", "hq"):
-                if user is None:
-                    raise ValidationError("The token is invalid!")
-                elif not user.is_staff:
-                    raise ValidationError("This operation is not allowed!")
-                elif endpoint == "hq":
-                    if not user.is_hq_user:
-                        raise ValidationError("This operation is not allowed!")
+            self.authorize(context, authentication, user)
 
         return next(root, info, **kwargs)
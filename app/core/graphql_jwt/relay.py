@@ -15,6 +15,7 @@ from graphql_jwt.signals import token_issued, token_refreshed
 import graphene
 
 from core.decorators import google_captcha3, within_validity_period
+from core.graphql_jwt.cache import invalidate_user_snapshots_on_commit
 from core.graphql_jwt import mixins
 from core.graphql_jwt.decorators import token_auth
 from core.graphql_jwt.refresh_token.relay import DeleteRefreshTokenCookie, Revoke
@@ -148,4 +149,5 @@ def refresh_token_rotated(
 # https://django-graphql-jwt.domake.io/signals.html#refresh-token-revoked
 @receiver(refresh_token_revoked)
 def refresh_token_revoked(sender, request, refresh_token: str, **kwargs):
-    pass
+    user = refresh_token.user
+    invalidate_user_snapshots_on_commit([(user.endpoint, user.email)])
@@ -10,6 +10,8 @@ from graphql_jwt.settings import jwt_settings
 from graphql_relay import to_global_id
 import jwt
 
+from core.graphql_jwt.cache import UserSnapshotCache
+
 
 def jwt_payload(user, context=None):
     jwt_datetime = datetime.utcnow() + jwt_settings.JWT_EXPIRATION_DELTA
@@ -106,9 +108,16 @@ def get_user_by_payload(payload):
     if not username:
         raise exceptions.JSONWebTokenError(_("Invalid payload"))
 
-    user = jwt_settings.JWT_GET_USER_BY_NATURAL_KEY_HANDLER(
-        endpoint=payload["endpoint"], email=username
-    )
+    user_cache = UserSnapshotCache(payload)
+    user = user_cache.get()
+
+    if user is None:
+        user = jwt_settings.JWT_GET_USER_BY_NATURAL_KEY_HANDLER(
+            endpoint=payload["endpoint"], email=username
+        )
+
+        if user is not None:
+            user_cache.set(user)
 
     if user is not None and not getattr(user, "is_active", True):
         raise exceptions.JSONWebTokenError(_("User is disabled"))
@@ -0,0 +1,114 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import sha256
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from django_tenants.utils import schema_context
+import requests
+
+CACHE_KEY_PREFIX = "captcha:token"
+
+
+class GoogleRecaptcha3Backend:
+    def __init__(self, endpoint: str, key_private: str, timeout: float = 2):
+        self.endpoint = endpoint
+        self.key_private = key_private
+        self.timeout = timeout
+        self.local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        # Sessions are not thread-safe, keep one per worker thread
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+
+        return self.local.session
+
+    def verify(self, token: str, action: str) -> dict:
+        response = self.session.post(
+            self.endpoint,
+            data={"secret": self.key_private, "response": token},
+            timeout=self.timeout,
+        )
+
+        return response.json()
+
+
+class StubBackend:
+    def __init__(self, score: float = 0.9, **kwargs):
+        self.score = score
+
+    def verify(self, token: str, action: str) -> dict:
+        return {
+            "success": bool(token),
+            "score": self.score,
+            "action": action,
+        }
+
+
+class CaptchaHelper:
+    def __init__(self):
+        self.options = settings.CAPTCHA["google_recaptcha3"]
+        self.backend = import_string(self.options["backend"])(
+            endpoint=self.options["endpoint"],
+            key_private=self.options["key_private"],
+            timeout=self.options["timeout"],
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.options["workers"], thread_name_prefix="captcha"
+        )
+
+    def get_threshold(self, action: str) -> float:
+        return self.options["threshold"].get(
+            action, self.options["threshold"]["default"]
+        )
+
+    def claim_token(self, token: str) -> bool:
+        key = f"{CACHE_KEY_PREFIX}:{sha256(token.encode()).hexdigest()}"
+
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            return cache.add(key, True, self.options["replay_timeout"])
+
+    def check(self, token: str, action: str) -> bool:
+        try:
+            res = self.backend.verify(token, action)
+
+            return all(
+                (
+                    res["success"],
+                    res["score"] > self.get_threshold(action),
+                    res["action"] == action,
+                )
+            )
+        except Exception:
+            return False
+
+    def verify(self, token: str, action: str) -> bool:
+        if not token or not self.claim_token(token):
+            return False
+
+        return self.check(token, action)
+
+    def verify_async(self, token: str, action: str) -> Future:
+        if not token or not self.claim_token(token):
+            future = Future()
+            future.set_result(False)
+
+            return future
+
+        return self.executor.submit(self.check, token, action)
+
+
+captcha_helper = None
+
+
+def get_captcha_helper() -> CaptchaHelper:
+    global captcha_helper
+
+    if captcha_helper is None:
+        captcha_helper = CaptchaHelper()
+
+    return captcha_helper
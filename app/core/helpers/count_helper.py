@@ -0,0 +1,47 @@
+from hashlib import sha256
+from typing import Tuple
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+CACHE_KEY_PREFIX = "graphql:count"
+
+
+def get_cache_key(queryset: QuerySet) -> str:
+    sql, params = queryset.query.sql_with_params()
+
+    return f"{CACHE_KEY_PREFIX}:{sha256(repr((sql, params)).encode()).hexdigest()}"
+
+
+def get_planner_estimate(queryset: QuerySet) -> int:
+    sql, params = queryset.order_by().query.sql_with_params()
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_estimated_count(queryset: QuerySet) -> Tuple[int, bool]:
+    key = get_cache_key(queryset)
+
+    count = cache.get(key)
+    if count is not None:
+        return count, False
+
+    # Only PostgreSQL exposes planner estimates, count exactly elsewhere
+    if connections[queryset.db].vendor == "postgresql":
+        estimate = get_planner_estimate(queryset)
+        if estimate > settings.TOTAL_COUNT["threshold"]:
+            return estimate, False
+
+    count = queryset.count()
+    cache.set(key, count, settings.TOTAL_COUNT["timeout"])
+
+    return count, True
@@ -0,0 +1,74 @@
+from hashlib import sha256
+from typing import Collection, List, Optional
+
+from django.conf import settings
+
+from graphene import Schema
+from graphene.validation import depth_limit_validator
+from graphql import DocumentNode, GraphQLError, parse, validate
+
+from core.helpers.cache_helper import LRUCache
+
+
+class CachedDocument:
+    def __init__(self, schema: Schema, query: str):
+        self.schema = schema
+        self.document: Optional[DocumentNode] = None
+        self.syntax_error: Optional[GraphQLError] = None
+        self._validation_errors = {}
+        self._depth_errors: Optional[List[GraphQLError]] = None
+
+        try:
+            self.document = parse(query)
+        except GraphQLError as e:
+            self.syntax_error = e
+
+    def get_validation_errors(
+        self, rules: Optional[Collection] = None, max_errors: Optional[int] = None
+    ) -> List[GraphQLError]:
+        if self.syntax_error:
+            return [self.syntax_error]
+
+        key = (tuple(rules) if rules is not None else None, max_errors)
+        if key not in self._validation_errors:
+            self._validation_errors[key] = validate(
+                self.schema.graphql_schema, self.document, rules, max_errors
+            )
+
+        return self._validation_errors[key]
+
+    def get_depth_errors(self) -> List[GraphQLError]:
+        if self.syntax_error:
+            return []
+
+        if self._depth_errors is None:
+            self._depth_errors = validate(
+                schema=self.schema.graphql_schema,
+                document_ast=self.document,
+                rules=(depth_limit_validator(max_depth=settings.GRAPHENE_MAX_DEPTH),),
+            )
+
+        return self._depth_errors
+
+
+class DocumentCache:
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize=maxsize, timeout=None)
+
+    def get(self, schema: Schema, query: str, query_hash: str = None) -> CachedDocument:
+        if query_hash is None:
+            query_hash = sha256(query.encode()).hexdigest()
+        key = (id(schema), query_hash)
+
+        document = self._cache.get(key)
+        if document is None:
+            document = CachedDocument(schema, query)
+            self._cache.set(key, document)
+
+        return document
+
+    def get_by_hash(self, schema: Schema, query_hash: str) -> Optional[CachedDocument]:
+        return self._cache.get((id(schema), query_hash))
+
+
+document_cache = DocumentCache(maxsize=settings.GRAPHENE_DOCUMENT_CACHE_SIZE)
@@ -1,22 +1,151 @@
+from ipaddress import ip_address, ip_network
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from django_tenants.utils import schema_context
 import requests
 
+from core.helpers.cache_helper import LRUCache
+
+CACHE_KEY_PREFIX = "ip:location"
+LOCATION_FIELDS = (
+    "ip",
+    "version",
+    "city",
+    "region",
+    "region_code",
+    "country",
+    "country_code",
+    "country_code_iso3",
+    "country_name",
+    "latitude",
+    "longitude",
+    "timezone",
+)
+
+# ipapi error bodies that mean the address has no location
+NOT_FOUND_REASONS = ("Reserved IP Address", "Invalid IP Address")
+
+
+class IPAPIBackend:
+    def __init__(self, endpoint: str = "https://ipapi.co/{ip}/json/", timeout=0.5):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def lookup(self, ip: str) -> Optional[dict]:
+        response = self.session.get(self.endpoint.format(ip=ip), timeout=self.timeout)
+        # Rate limits (429) and outages are failures, not unknown locations
+        response.raise_for_status()
+        response = response.json()
+
+        if response.get("error"):
+            if response.get("reserved") or response.get("reason") in NOT_FOUND_REASONS:
+                return None
+            raise ValueError(response.get("reason") or "The lookup failed!")
+
+        return {field: response.get(field) for field in LOCATION_FIELDS}
+
+
+class GeoIP2Backend:
+    def __init__(self, path: str):
+        try:
+            import geoip2.database
+            import maxminddb
+        except ImportError:
+            raise ImproperlyConfigured("GeoIP2Backend requires the geoip2 package.")
+
+        self.reader = geoip2.database.Reader(path, mode=maxminddb.MODE_MMAP)
+
+    def lookup(self, ip: str) -> Optional[dict]:
+        import geoip2.errors
+
+        try:
+            response = self.reader.city(ip)
+        except geoip2.errors.AddressNotFoundError:
+            return None
+
+        subdivision = response.subdivisions.most_specific
+
+        return {
+            "ip": ip,
+            "version": "IPv" + str(ip_address(ip).version),
+            "city": response.city.name,
+            "region": subdivision.name,
+            "region_code": subdivision.iso_code,
+            "country": response.country.iso_code,
+            "country_code": response.country.iso_code,
+            "country_code_iso3": None,
+            "country_name": response.country.name,
+            "latitude": response.location.latitude,
+            "longitude": response.location.longitude,
+            "timezone": response.location.time_zone,
+        }
+
+
+class IPLocationHelper:
+    def __init__(self):
+        options = settings.IP_LOCATION
+        self.backend = import_string(options["BACKEND"])(**options["OPTIONS"])
+        self.cache_options = options["CACHE"]
+        self.local_cache = LRUCache(
+            maxsize=self.cache_options["maxsize"],
+            timeout=self.cache_options["timeout"],
+        )
+
+    def get_cache_key(self, ip: str) -> Optional[str]:
+        try:
+            address = ip_address(ip)
+        except ValueError:
+            return None
+
+        if address.version == 4:
+            prefix_length = self.cache_options["prefix_length_v4"]
+        else:
+            prefix_length = self.cache_options["prefix_length_v6"]
+
+        return str(ip_network(f"{address}/{prefix_length}", strict=False))
+
+    def get_location(self, ip: str) -> dict:
+        # Unknown locations keep the dict shape with every field set to None
+        key = self.get_cache_key(ip)
+        if key is None:
+            return {**dict.fromkeys(LOCATION_FIELDS), "ip": ip}
+
+        location = self.local_cache.get(key)
+
+        if location is None:
+            with schema_context(settings.PUBLIC_SCHEMA_NAME):
+                location = cache.get(f"{CACHE_KEY_PREFIX}:{key}")
+
+                if location is None:
+                    try:
+                        location = self.backend.lookup(ip) or {}
+                        timeout = self.cache_options["timeout"]
+                    except (requests.RequestException, ValueError):
+                        location = {}
+                        timeout = self.cache_options["timeout_failure"]
+
+                    cache.set(f"{CACHE_KEY_PREFIX}:{key}", location, timeout)
+                else:
+                    timeout = self.cache_options["timeout"]
+
+            self.local_cache.set(key, location, timeout)
+
+        return {**dict.fromkeys(LOCATION_FIELDS), **location, "ip": ip}
+
+
+ip_location_helper = None
+
+
+def get_location_by_ip(ip: str) -> dict:
+    global ip_location_helper
+
+    if ip_location_helper is None:
+        ip_location_helper = IPLocationHelper()
 
-def get_location_by_ip(ip: str):
-    response = requests.get(f"https://ipapi.co/{ip}/json/").json()
-
-    location_data = {
-        "ip": response.get("ip"),
-        "version": response.get("version"),
-        "city": response.get("city"),
-        "region": response.get("region"),
-        "region_code": response.get("region_code"),
-        "country": response.get("country"),
-        "country_code": response.get("country_code"),
-        "country_code_iso3": response.get("country_code_iso3"),
-        "country_name": response.get("country_name"),
-        "latitude": response.get("latitude"),
-        "longitude": response.get("longitude"),
-        "timezone": response.get("timezone"),
-    }
-
-    return location_data
+    return ip_location_helper.get_location(ip)
@@ -0,0 +1,98 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from typing import List, Tuple
+import binascii
+import json
+import operator
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Model, Q, QuerySet
+
+Ordering = List[Tuple[str, bool]]
+
+
+def get_ordering(queryset: QuerySet) -> Ordering:
+    ordering = list(queryset.query.order_by)
+    if not ordering and queryset.query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+
+    fields = []
+    for field in ordering:
+        if not isinstance(field, str) or field == "?":
+            raise ValidationError("The ordering does not support cursor pagination!")
+
+        name = field.lstrip("-")
+        if name == queryset.model._meta.pk.name:
+            name = "pk"
+        fields.append((name, field.startswith("-")))
+        if name == "pk":
+            break
+    else:
+        # The primary key is the tie-breaker of every ordering
+        fields.append(("pk", False))
+
+    return fields
+
+
+def get_alias(index: int) -> str:
+    return f"keyset_{index}"
+
+
+def paginate(queryset: QuerySet, ordering: Ordering, cursor: str = None) -> QuerySet:
+    queryset = queryset.annotate(
+        **{get_alias(index): F(name) for index, (name, _) in enumerate(ordering)}
+    ).order_by(
+        *[
+            F(get_alias(index)).desc(nulls_first=True)
+            if descending
+            else F(get_alias(index)).asc(nulls_last=True)
+            for index, (_, descending) in enumerate(ordering)
+        ]
+    )
+
+    if cursor:
+        queryset = queryset.filter(
+            get_filter(ordering, decode_cursor(cursor, ordering))
+        )
+
+    return queryset
+
+
+def get_filter(ordering: Ordering, values: list) -> Q:
+    branches = []
+    equal = Q()
+    for index, ((_, descending), value) in enumerate(zip(ordering, values)):
+        alias = get_alias(index)
+        # NULLs sort last ascending and first descending
+        if value is None:
+            after = Q(**{f"{alias}__isnull": False}) if descending else None
+            same = Q(**{f"{alias}__isnull": True})
+        else:
+            after = Q(**{f"{alias}__{'lt' if descending else 'gt'}": value})
+            if not descending:
+                after |= Q(**{f"{alias}__isnull": True})
+            same = Q(**{alias: value})
+
+        if after is not None:
+            branches.append(equal & after)
+        equal &= same
+
+    return reduce(operator.or_, branches)
+
+
+def encode_cursor(node: Model, ordering: Ordering) -> str:
+    values = [getattr(node, get_alias(index)) for index in range(len(ordering))]
+
+    return urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str, ordering: Ordering) -> list:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("The cursor is invalid!")
+
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValidationError("The cursor is invalid!")
+
+    return values
@@ -0,0 +1,204 @@
+from hashlib import sha256
+from threading import Lock
+from typing import Optional
+import json
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http.request import HttpRequest
+
+from django_tenants.utils import schema_context
+from graphene import Schema
+from graphene_django.views import GraphQLView
+from graphql import GraphQLError
+
+from core.helpers.document_helper import CachedDocument, document_cache
+
+CACHE_KEY_PREFIX = "graphql:persisted_query"
+
+
+class PersistedQueryError(GraphQLError):
+    code = None
+
+    def __init__(self, message: str):
+        super().__init__(message, extensions={"code": self.code})
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedQueryHashMismatch(PersistedQueryError):
+    code = "BAD_USER_INPUT"
+
+    def __init__(self):
+        super().__init__("provided sha does not match query")
+
+
+class PersistedQueryNotAllowed(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_ALLOWED"
+
+    def __init__(self):
+        super().__init__("This operation is not allowed!")
+
+
+def get_query_hash(query: str) -> str:
+    return sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryHelper:
+    def __init__(self):
+        self.options = settings.GRAPHENE_PERSISTED_QUERIES
+        self._registry = None
+        self._lock = Lock()
+
+    @property
+    def registry(self) -> dict:
+        if self._registry is None:
+            with self._lock:
+                if self._registry is None:
+                    path = self.options["registry"]
+                    if path and os.path.exists(path):
+                        with open(path, encoding="utf-8") as f:
+                            self._registry = json.load(f)
+                    else:
+                        self._registry = {}
+
+        return self._registry
+
+    def get_hash_from_request(self, request: HttpRequest, data: dict) -> Optional[str]:
+        extensions = request.GET.get("extensions") or data.get("extensions")
+        if not extensions:
+            return None
+
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                return None
+
+        persisted_query = extensions.get("persistedQuery") or {}
+
+        return persisted_query.get("sha256Hash")
+
+    def get_query(self, query_hash: str) -> Optional[str]:
+        if query := self.registry.get(query_hash):
+            return query
+
+        if self.options["allow_list"]:
+            return None
+
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            return cache.get(f"{CACHE_KEY_PREFIX}:{query_hash}")
+
+    def set_query(self, query_hash: str, query: str) -> None:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            cache.set(
+                f"{CACHE_KEY_PREFIX}:{query_hash}", query, self.options["timeout"]
+            )
+
+    def get_document(
+        self,
+        schema: Schema,
+        request: HttpRequest,
+        data: dict,
+        query: Optional[str] = None,
+    ) -> Optional[CachedDocument]:
+        query_hash = self.get_hash_from_request(request, data)
+
+        if query_hash is None:
+            if not query:
+                return None
+            if (
+                self.options["allow_list"]
+                and get_query_hash(query) not in self.registry
+            ):
+                raise PersistedQueryNotAllowed()
+
+            return document_cache.get(schema, query)
+
+        if not self.options["enabled"]:
+            raise PersistedQueryNotSupported()
+
+        # A cached hash must never stand in for a different query
+        if query and get_query_hash(query) != query_hash:
+            raise PersistedQueryHashMismatch()
+
+        if document := document_cache.get_by_hash(schema, query_hash):
+            return document
+
+        if query:
+            if self.options["allow_list"] and query_hash not in self.registry:
+                raise PersistedQueryNotAllowed()
+            if query_hash not in self.registry:
+                self.set_query(query_hash, query)
+        else:
+            query = self.get_query(query_hash)
+            if query is None:
+                raise PersistedQueryNotFound()
+
+        return document_cache.get(schema, query, query_hash=query_hash)
+
+    def get_request_data(self, request: HttpRequest) -> dict:
+        # Same body parsing as GraphQLView, an unreadable body is left to the view
+        content_type = GraphQLView.get_content_type(request)
+
+        if content_type == "application/graphql":
+            return {"query": request.body.decode()}
+        elif content_type == "application/json":
+            try:
+                data = json.loads(request.body.decode() or "{}")
+            except ValueError:
+                return {}
+            return data if isinstance(data, dict) else {}
+        elif content_type in (
+            "application/x-www-form-urlencoded",
+            "multipart/form-data",
+        ):
+            return request.POST
+
+        return {}
+
+    def resolve(
+        self,
+        schema: Schema,
+        request: HttpRequest,
+        data: dict,
+        query: Optional[str] = None,
+    ) -> Optional[CachedDocument]:
+        # Resolved once per request, by DepthCheckMiddleware or by the view
+        resolved = getattr(request, "persisted_document", None)
+        if resolved is None or resolved[0] is not schema:
+            try:
+                resolved = (schema, self.get_document(schema, request, data, query))
+            except GraphQLError as e:
+                resolved = (schema, e)
+            request.persisted_document = resolved
+
+        if isinstance(resolved[1], GraphQLError):
+            raise resolved[1]
+
+        return resolved[1]
+
+    def resolve_request(
+        self, schema: Schema, request: HttpRequest
+    ) -> Optional[CachedDocument]:
+        data = self.get_request_data(request)
+
+        return self.resolve(
+            schema, request, data, request.GET.get("query") or data.get("query")
+        )
+
+
+persisted_query_helper = PersistedQueryHelper()
@@ -1,20 +1,155 @@
+from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import List
+from typing import Callable, Dict, Hashable, Iterable, List, Type
 
-from graphene_django import DjangoObjectType
-from promise import Promise
-from promise.dataloader import DataLoader
+from django.db import models
+from django.utils.module_loading import autodiscover_modules
 
+# Loader declarations by name, collected from <app>/graphql/loaders.py
+registry = {}
 
-def generate_loader_for_one_to_many(Type: DjangoObjectType, attr: str):
-    class Loader(DataLoader):
-        def batch_load_fn(self, keys: List[str]) -> Promise:
-            results_by_id_list = defaultdict(list)
-            lookup = {f"{attr}__in": keys}
 
-            for result in Type._meta.model.objects.filter(**lookup).iterator():
-                results_by_id_list[getattr(result, attr)].append(result)
+def register_loader(name: str, factory: Callable[["LoaderRegistry"], "Loader"]):
+    registry[name] = factory
 
-            return Promise.resolve([results_by_id_list.get(id, []) for id in keys])
 
-    return Loader
+class Loader(ABC):
+    default = None
+
+    def __init__(self, loaders: "LoaderRegistry", parent: Type[models.Model] = None):
+        self.loaders = loaders
+        self.parent = parent
+        self.cache = {}
+
+    @abstractmethod
+    def batch_load(self, keys: List[Hashable]) -> Dict:
+        pass
+
+    def load(self, key: Hashable):
+        if key not in self.cache:
+            # Load every key of the current page along with the requested one.
+            # Only connection pages are announced, nodes resolved elsewhere
+            # (Node.Field, DjangoListField, plain fields) load one key at a
+            # time unless their resolver calls loaders.announce() itself.
+            keys = [key] + [
+                pk
+                for pk in self.loaders.get_announced(self.parent)
+                if pk not in self.cache and pk != key
+            ]
+            results = self.batch_load(keys)
+            for pk in keys:
+                self.cache[pk] = results.get(pk, self.default)
+
+        return self.cache[key]
+
+    def load_many(self, keys: Iterable[Hashable]) -> list:
+        return [self.load(key) for key in keys]
+
+
+class OneToOneLoader(Loader):
+    def __init__(self, loaders, model: Type[models.Model], attr: str, parent=None):
+        super().__init__(loaders, parent)
+        self.model = model
+        self.attr = attr
+
+    def batch_load(self, keys: List[Hashable]) -> Dict:
+        lookup = {f"{self.attr}__in": keys}
+
+        return {
+            getattr(result, self.attr): result
+            for result in self.model.objects.filter(**lookup)
+        }
+
+
+class OneToManyLoader(OneToOneLoader):
+    @property
+    def default(self):
+        return []
+
+    def batch_load(self, keys: List[Hashable]) -> Dict:
+        results_by_id_list = defaultdict(list)
+        lookup = {f"{self.attr}__in": keys}
+
+        for result in self.model.objects.filter(**lookup).iterator():
+            results_by_id_list[getattr(result, self.attr)].append(result)
+
+        return results_by_id_list
+
+
+class ValueLoader(OneToOneLoader):
+    def __init__(self, loaders, model, attr: str, field: str, parent=None):
+        super().__init__(loaders, model, attr, parent)
+        self.field = field
+
+    def batch_load(self, keys: List[Hashable]) -> Dict:
+        lookup = {f"{self.attr}__in": keys}
+
+        return dict(
+            self.model.objects.filter(**lookup).values_list(self.attr, self.field)
+        )
+
+
+class TranslationLoader(OneToManyLoader):
+    def __init__(self, loaders, model, attr, parent=None, organization_attr=None):
+        super().__init__(loaders, model, attr, parent)
+        # None when the parent is the organization itself
+        self.organization_attr = organization_attr
+
+    def get_language_codes(self, root: models.Model, language_code: str = None):
+        if language_code:
+            yield language_code
+
+        if self.organization_attr is None:
+            yield root.language_code
+        else:
+            yield self.loaders.language_code_by_organization_loader.load(
+                getattr(root, self.organization_attr)
+            )
+
+    def load_translation(self, root: models.Model, language_code: str = None):
+        translations = self.load(root.pk)
+        if not translations:
+            return None
+
+        # Fallback chain: requested language, organization default, then any
+        translations_by_language = {
+            translation.language_code: translation for translation in translations
+        }
+        for code in self.get_language_codes(root, language_code):
+            if code in translations_by_language:
+                return translations_by_language[code]
+
+        return min(translations, key=lambda translation: translation.language_code)
+
+
+class LoaderRegistry:
+    discovered = False
+
+    def __init__(self):
+        if not LoaderRegistry.discovered:
+            autodiscover_modules("graphql.loaders")
+            LoaderRegistry.discovered = True
+
+        self.announced = defaultdict(dict)
+
+    def __getattr__(self, name: str) -> Loader:
+        try:
+            factory = registry[name]
+        except KeyError:
+            raise AttributeError(name)
+
+        loader = factory(self)
+        setattr(self, name, loader)
+
+        return loader
+
+    def announce(self, nodes: Iterable[models.Model]) -> None:
+        for node in nodes:
+            if isinstance(node, models.Model):
+                self.announced[node._meta.concrete_model][node.pk] = None
+
+    def get_announced(self, model: Type[models.Model]) -> Iterable[Hashable]:
+        if model is None:
+            return ()
+
+        return self.announced[model._meta.concrete_model].keys()
@@ -0,0 +1,156 @@
+import json
+import logging
+import random
+import re
+
+from django.db import connection
+from django.http.request import HttpRequest
+
+from graphene_django.views import GraphQLView
+from graphql import (
+    ArgumentNode,
+    GraphQLError,
+    ObjectFieldNode,
+    StringValueNode,
+    Visitor,
+    parse,
+    print_ast,
+    visit,
+)
+from graphql.execution import ExecutionResult
+
+logger = logging.getLogger(__name__)
+
+SENSITIVE_HEADERS = ("Authorization", "Cookie", "X-Csrftoken")
+# Matches password, oldPassword, token, refreshToken, captcha and the like
+SENSITIVE_KEYS = re.compile("pass|token|secret|captcha", re.IGNORECASE)
+REDACTED = "********"
+
+
+def redact(value, sensitive: bool = False):
+    # Only scalars are masked, e.g. tokenAuth keeps its shape and loses token
+    if isinstance(value, dict):
+        return {
+            key: redact(item, bool(SENSITIVE_KEYS.search(key)))
+            for key, item in value.items()
+        }
+    elif isinstance(value, list):
+        return [redact(item, sensitive) for item in value]
+    elif sensitive and value is not None:
+        return REDACTED
+
+    return value
+
+
+class RedactVisitor(Visitor):
+    def redact_node(self, node):
+        if SENSITIVE_KEYS.search(node.name.value) and isinstance(
+            node.value, StringValueNode
+        ):
+            return node.__class__(name=node.name, value=StringValueNode(value=REDACTED))
+
+        return None
+
+    def enter_argument(self, node: ArgumentNode, *args):
+        return self.redact_node(node)
+
+    def enter_object_field(self, node: ObjectFieldNode, *args):
+        return self.redact_node(node)
+
+
+def redact_query(query: str) -> str:
+    # Inline literals, e.g. tokenAuth(password: "..."), bypass the variables
+    if not query:
+        return query
+
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return query
+
+    redacted = visit(document, RedactVisitor())
+
+    return query if redacted is document else print_ast(redacted)
+
+
+def get_headers(request: HttpRequest) -> dict:
+    return {
+        key: value
+        for key, value in request.headers.items()
+        if key not in SENSITIVE_HEADERS
+    }
+
+
+def format_result(result: ExecutionResult) -> dict:
+    # Errors may already have been replaced by plain strings in process_errors
+    if result is None:
+        return None
+
+    formatted = {"data": result.data}
+    if result.errors:
+        formatted["errors"] = [GraphQLView.format_error(e) for e in result.errors]
+
+    return formatted
+
+
+class GraphQLRequestLogger:
+    def __init__(self, sample_rate: float = 1.0, verbose: bool = False):
+        self.sample_rate = sample_rate
+        self.verbose = verbose
+
+    def is_sampled(self, result: ExecutionResult) -> bool:
+        if result is not None and result.errors:
+            return True
+
+        return random.random() < self.sample_rate
+
+    def get_record(
+        self,
+        request: HttpRequest,
+        operation_name: str,
+        result: ExecutionResult,
+        duration: float,
+    ) -> dict:
+        return {
+            "path": request.path,
+            "schema_name": connection.schema_name,
+            "endpoint": request.headers.get("X-Endpoint"),
+            "operation_name": operation_name,
+            "user_ip": getattr(request, "user_ip", None),
+            "duration_ms": round(duration * 1000, 2),
+            "errors": len(result.errors or []) if result is not None else 0,
+        }
+
+    def log(
+        self,
+        request: HttpRequest,
+        data: dict,
+        query: str,
+        variables: dict,
+        operation_name: str,
+        result: ExecutionResult,
+        duration: float,
+    ) -> None:
+        if self.is_sampled(result):
+            record = self.get_record(request, operation_name, result, duration)
+            level = logging.WARNING if record["errors"] else logging.INFO
+            logger.log(level, json.dumps(record, default=str))
+
+        # DEBUG is rewritten per request by HealthCheckMiddleware, so only the
+        # verbose option gates the dump
+        if self.verbose:
+            logger.debug(
+                json.dumps(
+                    {
+                        "headers": get_headers(request),
+                        "remote_addr": request.META.get("REMOTE_ADDR"),
+                        "forwarded_for": request.META.get("HTTP_X_FORWARDED_FOR"),
+                        "query": redact_query(query),
+                        "variables": redact(variables),
+                        "operation_name": operation_name,
+                        "result": redact(format_result(result)),
+                        "optimizer_plans": getattr(request, "optimizer_plans", None),
+                    },
+                    default=str,
+                )
+            )
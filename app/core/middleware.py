@@ -1,14 +1,12 @@
-import json
-
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.http import HttpResponse
 from django.http.request import HttpRequest
+from django.middleware.csrf import CsrfViewMiddleware
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 
-from django_tenants.utils import schema_context
-from graphql import validate, parse
-from graphene.validation import depth_limit_validator
+from graphql import GraphQLError
 from ipware import get_client_ip
 
 from app.schemas.schema_auth import schema as schema_auth
@@ -16,76 +14,43 @@ from app.schemas.schema_dashboard import schema as schema_dashboard
 from app.schemas.schema_hq import schema as schema_hq
 from app.schemas.schema_website import schema as schema_website
 from core.helpers.ip_helper import get_location_by_ip
-from tenant.models import Domain
+from core.helpers.persisted_query_helper import persisted_query_helper
+from tenant.helpers.origin_helper import origin_registry
 
 
 class DepthCheckMiddleware(MiddlewareMixin):
+    schemas = (
+        ("/auth/", schema_auth),
+        ("/dashboard/", schema_dashboard),
+        ("/hq/", schema_hq),
+        ("/website/", schema_website),
+    )
+
     def __call__(self, request: HttpRequest):
         if not settings.PLAYGROUND:
-            body = json.loads(request.body.decode())
-            query = body["query"]
-
-            if request.path.startswith("/auth/"):
-                validation_errors = validate(
-                    schema=schema_auth.graphql_schema,
-                    document_ast=parse(query),
-                    rules=(
-                        depth_limit_validator(max_depth=settings.GRAPHENE_MAX_DEPTH),
-                    ),
-                )
-            elif request.path.startswith("/dashboard/"):
-                validation_errors = validate(
-                    schema=schema_dashboard.graphql_schema,
-                    document_ast=parse(query),
-                    rules=(
-                        depth_limit_validator(max_depth=settings.GRAPHENE_MAX_DEPTH),
-                    ),
-                )
-            elif request.path.startswith("/hq/"):
-                validation_errors = validate(
-                    schema=schema_hq.graphql_schema,
-                    document_ast=parse(query),
-                    rules=(
-                        depth_limit_validator(max_depth=settings.GRAPHENE_MAX_DEPTH),
-                    ),
-                )
-            elif request.path.startswith("/website/"):
-                validation_errors = validate(
-                    schema=schema_website.graphql_schema,
-                    document_ast=parse(query),
-                    rules=(
-                        depth_limit_validator(max_depth=settings.GRAPHENE_MAX_DEPTH),
-                    ),
-                )
-            if validation_errors:
-                raise ValidationError("Query is too nested")
+            for prefix, schema in self.schemas:
+                if request.path.startswith(prefix):
+                    try:
+                        document = persisted_query_helper.resolve_request(
+                            schema, request
+                        )
+                    except GraphQLError:
+                        # Returned by the view from the same resolution
+                        document = None
+                    if document and document.get_depth_errors():
+                        raise ValidationError("Query is too nested")
+                    break
 
         response = self.get_response(request)
 
         return response
 
 
-class DomainCorsMiddleware(MiddlewareMixin):
-    def __call__(self, request: HttpRequest):
-        for url in settings.CORS_ALLOWED_ORIGINS:
-            https_url = url.replace("http://", "https://")
-            if https_url not in settings.CORS_ALLOWED_ORIGINS:
-                settings.CORS_ALLOWED_ORIGINS.append(https_url)
-            if https_url not in settings.CORS_ORIGIN_WHITELIST:
-                settings.CORS_ORIGIN_WHITELIST.append(https_url)
-            if https_url not in settings.CSRF_TRUSTED_ORIGINS:
-                settings.CSRF_TRUSTED_ORIGINS.append(https_url)
-
-        with schema_context(settings.PUBLIC_SCHEMA_NAME):
-            domains = Domain.objects.values_list("domain", flat=True)
-            for domain in domains:
-                settings.CORS_ALLOWED_ORIGINS.append("https://" + domain)
-                settings.CORS_ORIGIN_WHITELIST.append("https://" + domain)
-                settings.CSRF_TRUSTED_ORIGINS.append("https://" + domain)
-
-        response = self.get_response(request)
-
-        return response
+class DomainCsrfViewMiddleware(CsrfViewMiddleware):
+    def _origin_verified(self, request: HttpRequest):
+        return super()._origin_verified(request) or (
+            request.META["HTTP_ORIGIN"] in origin_registry
+        )
 
 
 class HealthCheckMiddleware(MiddlewareMixin):
@@ -131,7 +96,11 @@ class HeaderHandlerMiddleware(MiddlewareMixin):
         request.user_location = request.headers.get("X-User-Location", None)
 
         if request.user_ip and request.user_location is None:
-            request.user_location = get_location_by_ip(request.user_ip)
+            # Always a dict, the lookup only runs when the location is read
+            user_ip = request.user_ip
+            request.user_location = SimpleLazyObject(
+                lambda: get_location_by_ip(user_ip)
+            )
 
         if not settings.PLAYGROUND:
             pass
@@ -0,0 +1,261 @@
+from typing import Dict, Iterable, List, Type
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Prefetch, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+
+from graphene import Dynamic
+from graphene.relay import Connection
+from graphene.utils.str_converters import to_camel_case
+from graphene_django import DjangoObjectType
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLResolveInfo,
+    InlineFragmentNode,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def optimizer_hints(
+    only: Iterable[str] = (),
+    select_related: Iterable[str] = (),
+    prefetch_related: Iterable[str] = (),
+    skip: bool = False,
+):
+    # Declares what a custom resolver reads from its root, skip opts it out
+    def decorator(func):
+        func.optimizer_hints = {
+            "only": tuple(only),
+            "select_related": tuple(select_related),
+            "prefetch_related": tuple(prefetch_related),
+            "skip": skip,
+        }
+
+        return func
+
+    return decorator
+
+
+def collect_selections(
+    info: GraphQLResolveInfo, field_nodes: Iterable
+) -> Dict[str, List[FieldNode]]:
+    selections = {}
+
+    def collect(selection_set):
+        if selection_set is None:
+            return
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                selections.setdefault(selection.name.value, []).append(selection)
+            elif isinstance(selection, FragmentSpreadNode):
+                collect(info.fragments[selection.name.value].selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                collect(selection.selection_set)
+
+    for field_node in field_nodes:
+        collect(field_node.selection_set)
+
+    return selections
+
+
+def get_graphql_fields(node_type: Type[DjangoObjectType]) -> dict:
+    fields = {}
+    for name, field in node_type._meta.fields.items():
+        if isinstance(field, Dynamic):
+            field = field.get_type()
+            if field is None:
+                continue
+        fields[getattr(field, "name", None) or to_camel_case(name)] = (name, field)
+
+    return fields
+
+
+def get_named_type(field):
+    field_type = field.type
+    while hasattr(field_type, "of_type"):
+        field_type = field_type.of_type
+
+    return field_type
+
+
+class QueryPlan:
+    def __init__(self, model: Type[models.Model]):
+        self.model = model
+        self.only = {model._meta.pk.name}
+        self.restricted = True
+        self.select_related = []
+        self.prefetch_related = []
+        self.skipped = []
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.restricted:
+            queryset = queryset.only(*sorted(self.only))
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        return queryset
+
+    def get_report(self) -> dict:
+        return {
+            "model": self.model._meta.label,
+            "only": sorted(self.only) if self.restricted else None,
+            "select_related": self.select_related,
+            "prefetch_related": [
+                {"lookup": prefetch.prefetch_to, "plan": prefetch.plan.get_report()}
+                if isinstance(prefetch, Prefetch)
+                else prefetch
+                for prefetch in self.prefetch_related
+            ],
+            "skipped": self.skipped,
+        }
+
+    def add_hints(self, hints: dict) -> None:
+        self.only.update(hints["only"])
+        for path in hints["select_related"]:
+            # A relation followed by select_related can not be deferred
+            names = path.split(LOOKUP_SEP)
+            self.only.update(
+                LOOKUP_SEP.join(names[: index + 1]) for index in range(len(names))
+            )
+        self.select_related.extend(hints["select_related"])
+        self.prefetch_related.extend(hints["prefetch_related"])
+
+    def add_select_related(self, name: str, plan: "QueryPlan") -> None:
+        self.only.add(name)
+        if plan.restricted:
+            self.only.update(f"{name}__{field}" for field in plan.only)
+        else:
+            self.only.update(
+                f"{name}__{field.name}" for field in plan.model._meta.concrete_fields
+            )
+        self.select_related.append(name)
+        self.select_related.extend(f"{name}__{field}" for field in plan.select_related)
+
+        for prefetch in plan.prefetch_related:
+            if isinstance(prefetch, Prefetch):
+                prefetch.add_prefix(name)
+            else:
+                prefetch = f"{name}__{prefetch}"
+            self.prefetch_related.append(prefetch)
+
+    def add_prefetch_related(self, name: str, field, plan: "QueryPlan") -> None:
+        if plan.restricted and not field.concrete and not field.many_to_many:
+            # Rows are matched back to their parent through the foreign key
+            plan.only.add(field.field.name)
+
+        prefetch = Prefetch(
+            name, queryset=plan.apply(plan.model._default_manager.all())
+        )
+        prefetch.plan = plan
+        self.prefetch_related.append(prefetch)
+
+
+def get_model_field(model: Type[models.Model], name: str):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Reverse relations are exposed under their accessor name
+        for field in model._meta.related_objects:
+            if field.get_accessor_name() == name:
+                return field
+
+    return None
+
+
+def get_plan(
+    info: GraphQLResolveInfo,
+    model: Type[models.Model],
+    node_type: Type[DjangoObjectType],
+    selections: Dict[str, List[FieldNode]],
+) -> QueryPlan:
+    plan = QueryPlan(model)
+    graphql_fields = get_graphql_fields(node_type)
+
+    for graphql_name, field_nodes in selections.items():
+        if graphql_name not in graphql_fields:
+            continue
+        name, graphql_field = graphql_fields[graphql_name]
+        if name == "id":
+            continue
+
+        resolver = getattr(node_type, f"resolve_{name}", None)
+        hints = getattr(resolver, "optimizer_hints", None)
+        if hints is not None:
+            if hints["skip"]:
+                plan.restricted = False
+                plan.skipped.append(name)
+            else:
+                plan.add_hints(hints)
+            continue
+
+        if resolver is not None:
+            # Unknown access pattern, keep every column of the row
+            plan.restricted = False
+            continue
+
+        related_type = get_named_type(graphql_field)
+        is_class = isinstance(related_type, type)
+        if is_class and issubclass(related_type, Connection):
+            # Nested connections run their own query from the primary key
+            continue
+
+        field = get_model_field(model, name)
+        if field is None:
+            plan.restricted = False
+            continue
+
+        if not field.is_relation:
+            plan.only.add(field.name)
+            continue
+
+        if is_class and issubclass(related_type, DjangoObjectType):
+            related_plan = get_plan(
+                info,
+                field.related_model,
+                related_type,
+                collect_selections(info, field_nodes),
+            )
+        else:
+            related_plan = QueryPlan(field.related_model)
+            related_plan.restricted = False
+
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            plan.add_select_related(name, related_plan)
+        else:
+            plan.add_prefetch_related(name, field, related_plan)
+
+    return plan
+
+
+def optimize(
+    queryset: QuerySet,
+    info: GraphQLResolveInfo,
+    node_type: Type[DjangoObjectType],
+    selections: Dict[str, List[FieldNode]] = None,
+) -> QuerySet:
+    if selections is None:
+        # Connection fields select their nodes through edges { node { ... } }
+        edges = collect_selections(info, info.field_nodes).get("edges", [])
+        nodes = collect_selections(info, edges).get("node", [])
+        selections = collect_selections(info, nodes)
+
+    plan = get_plan(info, queryset.model, node_type, selections)
+
+    if settings.GRAPHENE_OPTIMIZER["report"]:
+        report = {"path": info.path.as_list(), "plan": plan.get_report()}
+        logger.debug(report)
+
+        request = info.context
+        if not hasattr(request, "optimizer_plans"):
+            request.optimizer_plans = []
+        request.optimizer_plans.append(report)
+
+    return plan.apply(queryset)
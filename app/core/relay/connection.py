@@ -1,8 +1,27 @@
+from django.conf import settings
+from django.db.models import QuerySet
+
 from graphene_django.filter import DjangoFilterConnectionField
 import graphene
 
+from core import optimizer
+from core.helpers import count_helper, keyset_helper
+
+
+class Page(list):
+    def __init__(self, queryset: QuerySet):
+        super().__init__(queryset)
+        self.count_queryset = queryset.count_queryset
+        self.keyset_ordering = getattr(queryset, "keyset_ordering", None)
+
 
 class DjangoFilterConnectionField(DjangoFilterConnectionField):
+    def __init__(self, type_, *args, **kwargs):
+        kwargs.setdefault("page_number", graphene.Int())
+        kwargs.setdefault("page_size", graphene.Int())
+        kwargs.setdefault("page_cursor", graphene.String())
+        super().__init__(type_, *args, **kwargs)
+
     @classmethod
     def resolve_queryset(
         cls,
@@ -17,19 +36,92 @@ class DjangoFilterConnectionField(DjangoFilterConnectionField):
             connection, iterable, info, args, filtering_args, filterset_class
         )
 
-        total_count = qs.count()
+        # Counted lazily, only when totalCount or estimatedCount is selected
+        count_qs = qs
+        qs = optimizer.optimize(qs, info, connection._meta.node)
+
+        page_cursor = args.get("page_cursor")
+        page_number = args.get("page_number") or 1
+        page_size = args.get("page_size") or 25
+        if page_cursor is not None and args.get("first"):
+            page_size = args["first"]
+        page_size = max(
+            1, min(page_size, settings.GRAPHENE["RELAY_CONNECTION_MAX_LIMIT"])
+        )
 
-        page_number = args.get("page_number", 1)
-        page_size = args.get("page_size", 25)
+        if page_cursor is not None:
+            # Keyset pagination, opted into with pageCursor ("" for the first
+            # page), deep pages cost the same as the first one
+            ordering = keyset_helper.get_ordering(qs)
+            qs = keyset_helper.paginate(qs, ordering, page_cursor)
 
-        start = (page_number - 1) * page_size
-        end = start + page_size
+            # One extra row tells whether there is a next page
+            args["first"] = page_size
+            sliced_qs = qs[: page_size + 1]
+            sliced_qs.keyset_ordering = ordering
+        else:
+            start = (page_number - 1) * page_size
+            end = start + page_size
 
-        sliced_qs = qs[start:end]
-        sliced_qs.total_count = total_count
+            sliced_qs = qs[start:end]
+        sliced_qs.count_queryset = count_qs
 
         return sliced_qs
 
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+        if isinstance(iterable, QuerySet) and hasattr(iterable, "count_queryset"):
+            # The page is fetched once, its length replaces graphene's count()
+            iterable = Page(iterable)
+
+        return super().resolve_connection(connection, args, iterable, max_limit)
+
+    @classmethod
+    def connection_resolver(
+        cls,
+        resolver,
+        connection,
+        default_manager,
+        queryset_resolver,
+        max_limit,
+        enforce_first_or_last,
+        root,
+        info,
+        **args,
+    ):
+        connection = super().connection_resolver(
+            resolver,
+            connection,
+            default_manager,
+            queryset_resolver,
+            max_limit,
+            enforce_first_or_last,
+            root,
+            info,
+            **args,
+        )
+
+        ordering = getattr(connection.iterable, "keyset_ordering", None)
+        if ordering is not None:
+            for edge in connection.edges:
+                edge.cursor = keyset_helper.encode_cursor(edge.node, ordering)
+            if connection.edges:
+                connection.page_info.start_cursor = connection.edges[0].cursor
+                connection.page_info.end_cursor = connection.edges[-1].cursor
+            connection.page_info.has_previous_page = bool(args.get("page_cursor"))
+
+        # Let loaders batch over every node of the page
+        loaders = getattr(info.context, "loaders", None)
+        if loaders is not None:
+            loaders.announce(edge.node for edge in connection.edges)
+
+        return connection
+
+
+class CountEstimate(graphene.ObjectType):
+    count = graphene.Int(required=True)
+    is_exact = graphene.Boolean(required=True)
+
 
 class ExtendedConnection(graphene.relay.Connection):
     class Meta:
@@ -45,7 +137,30 @@ class ExtendedConnection(graphene.relay.Connection):
             required=True,
             resolver=cls.resolve_total_count,
         )
+        cls._meta.fields["estimated_count"] = graphene.Field(
+            type_=CountEstimate,
+            name="estimatedCount",
+            description="Estimated number of items in the queryset.",
+            required=True,
+            resolver=cls.resolve_estimated_count,
+        )
         return result
 
+    def get_count_queryset(self):
+        return getattr(self.iterable, "count_queryset", self.iterable)
+
     def resolve_total_count(self, *_) -> int:
-        return getattr(self.iterable, "total_count", self.iterable.count())
+        queryset = self.get_count_queryset()
+        if isinstance(queryset, QuerySet):
+            return queryset.count()
+
+        return len(queryset)
+
+    def resolve_estimated_count(self, *_) -> CountEstimate:
+        queryset = self.get_count_queryset()
+        if isinstance(queryset, QuerySet):
+            count, is_exact = count_helper.get_estimated_count(queryset)
+        else:
+            count, is_exact = len(queryset), True
+
+        return CountEstimate(count=count, is_exact=is_exact)
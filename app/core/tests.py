@@ -0,0 +1,462 @@
+from types import SimpleNamespace
+from unittest import mock
+import json
+import threading
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from django_tenants.test.cases import TenantTestCase
+from graphene_django import DjangoObjectType
+from graphql import GraphQLError, parse
+from graphql.execution import ExecutionResult
+import graphene
+import requests
+
+from core import optimizer
+from core.decorators import google_captcha3
+from core.helpers import captcha_helper, keyset_helper
+from core.helpers.ip_helper import LOCATION_FIELDS, IPAPIBackend, IPLocationHelper
+from core.helpers.persisted_query_helper import (
+    PersistedQueryHashMismatch,
+    PersistedQueryHelper,
+    PersistedQueryNotFound,
+    get_query_hash,
+)
+from core.loaders import Loader, LoaderRegistry
+from core.loggers import REDACTED, GraphQLRequestLogger, format_result
+from core.relay.connection import DjangoFilterConnectionField
+from organization.models import Organization
+from role.graphql.hq.types.role import RoleNode
+from role.models import Role
+
+
+class Query(graphene.ObjectType):
+    hello = graphene.String()
+    goodbye = graphene.String()
+
+
+schema = graphene.Schema(query=Query)
+
+
+@override_settings(
+    GRAPHENE_PERSISTED_QUERIES={
+        "enabled": True,
+        "allow_list": False,
+        "registry": None,
+        "timeout": 60,
+    }
+)
+class PersistedQueryHelperTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.persisted_query_helper = PersistedQueryHelper()
+
+    def get_extensions(self, query_hash: str) -> dict:
+        return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+    def post(self, data: dict):
+        return self.factory.post(
+            "/dashboard/", json.dumps(data), content_type="application/json"
+        )
+
+    def test_hash_mismatch_is_raised_for_a_cached_hash(self):
+        query = "{ hello }"
+        data = {
+            "query": query,
+            "extensions": self.get_extensions(get_query_hash(query)),
+        }
+        self.persisted_query_helper.get_document(schema, self.post(data), data, query)
+
+        data["query"] = "{ goodbye }"
+        with self.assertRaises(PersistedQueryHashMismatch):
+            self.persisted_query_helper.get_document(
+                schema, self.post(data), data, data["query"]
+            )
+
+    def test_unknown_hash_is_not_found(self):
+        data = {"extensions": self.get_extensions(get_query_hash("{ unknown }"))}
+
+        with self.assertRaises(PersistedQueryNotFound):
+            self.persisted_query_helper.get_document(schema, self.post(data), data)
+
+    def test_get_request_without_body_is_resolved(self):
+        query = "{ hello }"
+        extensions = self.get_extensions(get_query_hash(query))
+        data = {"query": query, "extensions": extensions}
+        self.persisted_query_helper.get_document(schema, self.post(data), data, query)
+
+        request = self.factory.get(
+            "/dashboard/", {"extensions": json.dumps(extensions)}
+        )
+        document = self.persisted_query_helper.resolve_request(schema, request)
+
+        self.assertIsNotNone(document.document)
+
+    def test_document_is_resolved_once_per_request(self):
+        query = "{ hello }"
+        data = {"query": query}
+        request = self.post(data)
+
+        with mock.patch.object(
+            self.persisted_query_helper,
+            "get_document",
+            wraps=self.persisted_query_helper.get_document,
+        ) as get_document:
+            self.persisted_query_helper.resolve_request(schema, request)
+            self.persisted_query_helper.resolve(schema, request, data, query)
+
+        get_document.assert_called_once()
+
+
+class GraphQLRequestLoggerTestCase(SimpleTestCase):
+    def test_format_result_accepts_processed_errors(self):
+        result = ExecutionResult(
+            data=None, errors=["Can not find this user!", GraphQLError("Boom")]
+        )
+
+        self.assertEqual(
+            format_result(result),
+            {
+                "data": None,
+                "errors": [
+                    {"message": "Can not find this user!"},
+                    GraphQLError("Boom").formatted,
+                ],
+            },
+        )
+
+    def test_verbose_log_accepts_processed_errors(self):
+        request = RequestFactory().post("/dashboard/")
+        result = ExecutionResult(data=None, errors=["Can not find this user!"])
+
+        with self.assertLogs("core.loggers", level="DEBUG") as logs:
+            GraphQLRequestLogger(verbose=True).log(
+                request, {}, "{ hello }", None, None, result, 0.1
+            )
+
+        self.assertIn("Can not find this user!", logs.output[-1])
+
+    @override_settings(DEBUG=False)
+    def test_verbose_log_redacts_credentials(self):
+        request = RequestFactory().post(
+            "/dashboard/", HTTP_AUTHORIZATION="JWT secret-jwt"
+        )
+        result = ExecutionResult(data={"tokenAuth": {"token": "issued-jwt"}})
+
+        with self.assertLogs("core.loggers", level="DEBUG") as logs:
+            GraphQLRequestLogger(verbose=True).log(
+                request,
+                {},
+                'mutation { tokenAuth(password: "inline-secret") { token } }',
+                {"password": "variable-secret"},
+                None,
+                result,
+                0.1,
+            )
+
+        dump = json.loads(logs.records[-1].getMessage())
+        self.assertNotIn("Authorization", dump["headers"])
+        self.assertEqual(dump["variables"], {"password": REDACTED})
+        self.assertEqual(dump["result"]["data"]["tokenAuth"]["token"], REDACTED)
+        for secret in ("secret-jwt", "issued-jwt", "inline-secret", "variable-secret"):
+            self.assertNotIn(secret, logs.output[-1])
+
+
+class NotFoundBackend:
+    def lookup(self, ip: str):
+        return None
+
+
+@override_settings(
+    IP_LOCATION={
+        "BACKEND": "core.tests.NotFoundBackend",
+        "OPTIONS": {},
+        "CACHE": {
+            "maxsize": 10,
+            "prefix_length_v4": 24,
+            "prefix_length_v6": 48,
+            "timeout": 60,
+            "timeout_failure": 60,
+        },
+    }
+)
+class IPLocationHelperTestCase(SimpleTestCase):
+    def test_unknown_location_keeps_the_dict_shape(self):
+        location = IPLocationHelper().get_location("192.0.2.1")
+
+        self.assertEqual(set(location), set(LOCATION_FIELDS))
+        self.assertEqual(location["ip"], "192.0.2.1")
+        self.assertIsNone(location["city"])
+
+    def test_invalid_ip_keeps_the_dict_shape(self):
+        location = IPLocationHelper().get_location("not-an-ip")
+
+        self.assertEqual(set(location), set(LOCATION_FIELDS))
+
+
+class IPAPIBackendTestCase(SimpleTestCase):
+    def lookup(self, status_code: int, body: dict):
+        backend = IPAPIBackend()
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(body).encode()
+
+        with mock.patch.object(backend.session, "get", return_value=response):
+            return backend.lookup("192.0.2.1")
+
+    def test_reserved_address_has_no_location(self):
+        body = {"error": True, "reason": "Reserved IP Address", "reserved": True}
+
+        self.assertIsNone(self.lookup(200, body))
+
+    def test_rate_limit_is_a_failure(self):
+        body = {"error": True, "reason": "RateLimited"}
+
+        with self.assertRaises(requests.HTTPError):
+            self.lookup(429, body)
+        with self.assertRaises(ValueError):
+            self.lookup(200, body)
+
+    @override_settings(
+        IP_LOCATION={
+            "BACKEND": "core.helpers.ip_helper.IPAPIBackend",
+            "OPTIONS": {},
+            "CACHE": {
+                "maxsize": 10,
+                "prefix_length_v4": 24,
+                "prefix_length_v6": 48,
+                "timeout": 60 * 60 * 24,
+                "timeout_failure": 60,
+            },
+        }
+    )
+    def test_failure_is_cached_briefly(self):
+        helper = IPLocationHelper()
+        helper.backend.session.get = mock.Mock(
+            side_effect=requests.HTTPError("429 Too Many Requests")
+        )
+
+        with mock.patch("core.helpers.ip_helper.cache") as cache:
+            cache.get.return_value = None
+            helper.get_location("192.0.2.1")
+
+        self.assertEqual(cache.set.call_args.args[2], 60)
+
+
+@override_settings(
+    CAPTCHA={
+        "google_recaptcha3": {
+            "enabled": True,
+            "backend": "core.helpers.captcha_helper.StubBackend",
+            "concurrent": True,
+            "key_public": "",
+            "key_private": "",
+            "endpoint": "",
+            "threshold": {"default": 0.5},
+            "timeout": 1,
+            "replay_timeout": 60,
+            "workers": 1,
+        }
+    }
+)
+class GoogleCaptcha3TestCase(SimpleTestCase):
+    def setUp(self):
+        captcha_helper.captcha_helper = None
+
+    def test_mutation_does_not_run_before_a_failed_verification(self):
+        mutate = mock.Mock()
+
+        with self.assertRaises(ValidationError):
+            google_captcha3("auth")(mutate)(None, captcha="")
+
+        mutate.assert_not_called()
+
+    def test_mutation_runs_after_a_successful_verification(self):
+        mutate = mock.Mock(return_value="ok")
+
+        result = google_captcha3("auth")(mutate)(None, captcha="token-1")
+
+        self.assertEqual(result, "ok")
+
+    def test_replayed_token_is_rejected(self):
+        mutate = mock.Mock()
+        google_captcha3("auth")(mutate)(None, captcha="token-2")
+
+        with self.assertRaises(ValidationError):
+            google_captcha3("auth")(mutate)(None, captcha="token-2")
+
+        mutate.assert_called_once()
+
+    def test_sessions_are_not_shared_across_threads(self):
+        backend = captcha_helper.GoogleRecaptcha3Backend(endpoint="", key_private="")
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(backend.session))
+        thread.start()
+        thread.join()
+
+        self.assertIs(backend.session, backend.session)
+        self.assertIsNot(sessions[0], backend.session)
+
+
+class KeyLoader(Loader):
+    def __init__(self, loaders, parent=None):
+        super().__init__(loaders, parent)
+        self.batches = []
+
+    def batch_load(self, keys):
+        self.batches.append(list(keys))
+
+        return {key: f"value-{key}" for key in keys}
+
+
+class LoaderTestCase(SimpleTestCase):
+    def setUp(self):
+        self.loaders = LoaderRegistry()
+
+    def test_loader_requires_batch_load(self):
+        with self.assertRaises(TypeError):
+            Loader(self.loaders)
+
+    def test_announced_nodes_are_loaded_in_one_batch(self):
+        loader = KeyLoader(self.loaders, parent=Role)
+        self.loaders.announce(Role(pk=pk) for pk in (1, 2, 3))
+
+        self.assertEqual(loader.load(2), "value-2")
+        self.assertEqual(loader.load_many([1, 3]), ["value-1", "value-3"])
+        self.assertEqual(loader.batches, [[2, 1, 3]])
+
+    def test_unannounced_nodes_are_loaded_alone(self):
+        loader = KeyLoader(self.loaders, parent=Role)
+
+        loader.load(1)
+        loader.load(2)
+
+        self.assertEqual(loader.batches, [[1], [2]])
+
+
+class KeysetPaginationTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        organization = Organization.objects.create(schema_name=self.tenant.schema_name)
+        for slug in ("b", None, "a", "c", "b"):
+            Role.objects.create(organization=organization, slug=slug)
+
+    def walk(self, queryset, page_size: int = 2) -> list:
+        ordering = keyset_helper.get_ordering(queryset)
+        roles = []
+        cursor = None
+        while True:
+            page = list(keyset_helper.paginate(queryset, ordering, cursor)[:page_size])
+            roles += page
+            if len(page) < page_size:
+                return roles
+            cursor = keyset_helper.encode_cursor(page[-1], ordering)
+
+    def test_cursors_walk_every_row_once(self):
+        for order_by in ("slug", "-slug"):
+            with self.subTest(order_by=order_by):
+                queryset = Role.objects.order_by(order_by)
+
+                self.assertEqual(
+                    [role.pk for role in self.walk(queryset)],
+                    [role.pk for role in queryset.order_by(order_by, "pk")],
+                )
+
+    def test_invalid_cursor_is_rejected(self):
+        queryset = Role.objects.order_by("slug")
+        ordering = keyset_helper.get_ordering(queryset)
+
+        for cursor in ("not-a-cursor", keyset_helper.encode_cursor(Role(), [])):
+            with self.subTest(cursor=cursor), self.assertRaises(ValidationError):
+                keyset_helper.paginate(queryset, ordering, cursor)
+
+    def test_page_is_not_counted(self):
+        queryset = Role.objects.order_by("slug")[:3]
+        queryset.count_queryset = Role.objects.all()
+
+        # django-tenants also sets the search_path, so queries are not counted
+        with CaptureQueriesContext(connection) as queries:
+            page = DjangoFilterConnectionField.resolve_connection(
+                RoleNode._meta.connection, {"first": 2}, queryset
+            )
+
+        self.assertFalse(
+            [query for query in queries if "COUNT(" in query["sql"].upper()]
+        )
+
+        self.assertEqual(len(page.edges), 2)
+        self.assertTrue(page.page_info.has_next_page)
+        self.assertEqual(page.iterable.count_queryset.count(), 5)
+
+
+class RoleOrganizationNode(DjangoObjectType):
+    class Meta:
+        model = Role
+        fields = ("id", "slug")
+        skip_registry = True
+
+    language_code = graphene.String()
+
+    @staticmethod
+    @optimizer.optimizer_hints(select_related=("organization",))
+    def resolve_language_code(root: Role, info):
+        return root.organization.language_code
+
+
+def get_info(query: str):
+    operation = parse(query).definitions[0]
+    info = SimpleNamespace(
+        fragments={},
+        path=mock.Mock(as_list=mock.Mock(return_value=["roles"])),
+        context=SimpleNamespace(),
+    )
+
+    return info, optimizer.collect_selections(info, [operation])
+
+
+class OptimizerTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def test_plan_only_loads_selected_columns(self):
+        info, selections = get_info("{ slug }")
+
+        plan = optimizer.get_plan(info, Role, RoleOrganizationNode, selections)
+
+        self.assertEqual(plan.only, {"id", "slug"})
+        self.assertEqual(plan.select_related, [])
+
+    def test_select_related_hint_keeps_the_relation(self):
+        organization = Organization.objects.create(
+            schema_name=self.tenant.schema_name, language_code="en"
+        )
+        Role.objects.create(organization=organization, slug="staff")
+        info, selections = get_info("{ slug languageCode }")
+
+        plan = optimizer.get_plan(info, Role, RoleOrganizationNode, selections)
+        (role,) = plan.apply(Role.objects.all())
+
+        self.assertIn("organization", plan.only)
+        self.assertEqual(plan.select_related, ["organization"])
+        with self.assertNumQueries(0):
+            self.assertEqual(role.organization.language_code, "en")
+
+    def test_report_follows_its_own_setting(self):
+        for report in (False, True):
+            with self.subTest(report=report), override_settings(
+                DEBUG=not report, GRAPHENE_OPTIMIZER={"report": report}
+            ):
+                info, selections = get_info("{ slug }")
+
+                optimizer.optimize(
+                    Role.objects.all(), info, RoleOrganizationNode, selections
+                )
+
+                self.assertEqual(hasattr(info.context, "optimizer_plans"), report)
@@ -1,13 +1,116 @@
 import re
+import time
 
 from django.conf import settings
-from django.db import connection
+from django.db import connection, transaction
+from django.http import HttpResponseNotAllowed
 from django.http.request import HttpRequest
+from django.http.response import HttpResponseBadRequest
+from django.utils.module_loading import import_string
 
-from graphene_django.views import GraphQLView
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from graphql import GraphQLError, OperationType, get_operation_ast
+from graphql.execution import ExecutionResult, execute_sync
 
+from core.helpers.persisted_query_helper import persisted_query_helper
+from core.loaders import LoaderRegistry
+
+
+class CachedDocumentGraphQLView(GraphQLView):
+    validation_rules = getattr(GraphQLView, "validation_rules", None)
+
+    def get_context(self, request: HttpRequest):
+        request.loaders = LoaderRegistry()
+
+        return request
+
+    def execute_graphql_request(
+        self,
+        request: HttpRequest,
+        data,
+        query,
+        variables,
+        operation_name,
+        show_graphiql=False,
+    ):
+        try:
+            cached_document = persisted_query_helper.resolve(
+                self.schema, request, data, query
+            )
+        except GraphQLError as e:
+            return ExecutionResult(errors=[e])
+
+        if cached_document is None:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        if cached_document.syntax_error:
+            return ExecutionResult(errors=[cached_document.syntax_error])
+
+        document = cached_document.document
+        operation_ast = get_operation_ast(document, operation_name)
+
+        if request.method.lower() == "get":
+            if operation_ast and operation_ast.operation != OperationType.QUERY:
+                if show_graphiql:
+                    return None
+
+                raise HttpError(
+                    HttpResponseNotAllowed(
+                        ["POST"],
+                        "Can only perform a {} operation from a POST request.".format(
+                            operation_ast.operation.value
+                        ),
+                    )
+                )
+
+        try:
+            validation_errors = cached_document.get_validation_errors(
+                self.validation_rules,
+                getattr(graphene_settings, "MAX_VALIDATION_ERRORS", None),
+            )
+            if validation_errors:
+                return ExecutionResult(data=None, errors=validation_errors)
+
+            options = {
+                "schema": self.schema.graphql_schema,
+                "document": document,
+                "root_value": self.get_root_value(request),
+                "variable_values": variables,
+                "operation_name": operation_name,
+                "context_value": self.get_context(request),
+                "middleware": self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                options["execution_context_class"] = self.execution_context_class
+
+            if (
+                operation_ast
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute_sync(**options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            return execute_sync(**options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+
+class ErrorGraphQLView(CachedDocumentGraphQLView):
+    request_logger = import_string(settings.GRAPHENE_REQUEST_LOGGER["BACKEND"])(
+        **settings.GRAPHENE_REQUEST_LOGGER["OPTIONS"]
+    )
 
-class ErrorGraphQLView(GraphQLView):
     def execute_graphql_request(
         self,
         request: HttpRequest,
@@ -17,42 +120,41 @@ class ErrorGraphQLView(GraphQLView):
         operation_name,
         show_graphiql,
     ):
-        # print(request.geolocation)
+        started_at = time.perf_counter()
 
         result = super().execute_graphql_request(
             request, data, query, variables, operation_name, show_graphiql
         )
-        print(request)
-        print(request.META.get("HTTP_X_FORWARDED_FOR"))
-        print(request.META.get("REMOTE_ADDR"))
-        print(request.headers)
-        print(data)
-        print(query)
-        print(variables)
-        print(operation_name)
-        print(show_graphiql)
-        print(connection.schema_name)
-        result = super().execute_graphql_request(
-            request, data, query, variables, operation_name, show_graphiql
+
+        if result is not None and result.errors and not settings.PLAYGROUND:
+            result.errors = self.process_errors(result.errors)
+
+        self.request_logger.log(
+            request,
+            data,
+            query,
+            variables,
+            operation_name,
+            result,
+            time.perf_counter() - started_at,
         )
-        print(result)
 
-        if not settings.PLAYGROUND and result.errors:
-            for error in result.errors:
-                try:
-                    raise error.original_error
-                except Exception as e:
-                    for arg in e.args:
-                        try:
-                            if "IntegrityError" in arg and "is not present" in str(
-                                error
-                            ):
-                                string = re.search("Key \\((.*)\\)=", str(error)).group(
-                                    1
-                                )
-                                if string:
-                                    string = re.search("(.*)_", string).group(1)
-                                result.errors = ["Can not find this " + string + "!"]
-                        except TypeError:
-                            pass
         return result
+
+    def process_errors(self, errors: list) -> list:
+        for error in errors:
+            original_error = getattr(error, "original_error", None)
+            if original_error is None:
+                continue
+
+            for arg in original_error.args:
+                try:
+                    if "IntegrityError" in arg and "is not present" in str(error):
+                        string = re.search("Key \\((.*)\\)=", str(error)).group(1)
+                        if string:
+                            string = re.search("(.*)_", string).group(1)
+                        return ["Can not find this " + string + "!"]
+                except TypeError:
+                    pass
+
+        return errors
@@ -0,0 +1,65 @@
+from django.conf import settings
+
+from graphene import ResolveInfo
+import graphene
+
+from core.graphql_jwt.decorators import user_passes_test
+from core.helpers import keyset_helper
+from log.graphql.dashboard.types.log import LogConnection, LogNode
+from log.models import Log
+
+
+class LogQuery(graphene.ObjectType):
+    log = graphene.relay.Node.Field(LogNode)
+    logs = graphene.Field(
+        LogConnection,
+        first=graphene.Int(),
+        after=graphene.String(),
+        user_id=graphene.UUID(),
+        action=graphene.String(),
+        created_at_gte=graphene.DateTime(),
+        created_at_lt=graphene.DateTime(),
+    )
+
+    @staticmethod
+    @user_passes_test(lambda user: user.is_authenticated and user.is_admin)
+    def resolve_logs(root, info: ResolveInfo, first: int = 25, after=None, **input):
+        # Keyset pagination on (created_at, id), served by log_log_created_11382e_idx
+        # and the (user, created_at) / (action, created_at) indexes
+        first = max(1, min(first, settings.GRAPHENE["RELAY_CONNECTION_MAX_LIMIT"]))
+
+        queryset = Log.objects.only(
+            "id", "user_id", "action", "ip", "location", "created_at"
+        )
+        if input.get("user_id"):
+            queryset = queryset.filter(user_id=input["user_id"])
+        if input.get("action"):
+            queryset = queryset.filter(action=input["action"])
+        if input.get("created_at_gte"):
+            queryset = queryset.filter(created_at__gte=input["created_at_gte"])
+        if input.get("created_at_lt"):
+            queryset = queryset.filter(created_at__lt=input["created_at_lt"])
+
+        ordering = keyset_helper.get_ordering(queryset)
+        queryset = keyset_helper.paginate(queryset, ordering, after)
+
+        logs = list(queryset[: first + 1])
+        has_next_page = len(logs) > first
+        logs = logs[:first]
+
+        edges = [
+            LogConnection.Edge(
+                node=log, cursor=keyset_helper.encode_cursor(log, ordering)
+            )
+            for log in logs
+        ]
+
+        return LogConnection(
+            edges=edges,
+            page_info=graphene.relay.PageInfo(
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+                has_previous_page=after is not None,
+                has_next_page=has_next_page,
+            ),
+        )
@@ -0,0 +1,35 @@
+from graphene import ResolveInfo
+from graphene_django import DjangoObjectType
+import graphene
+
+from core.graphql_jwt.decorators import user_passes_test
+from log.models import Log
+
+
+class LogNode(DjangoObjectType):
+    class Meta:
+        model = Log
+        fields = (
+            "id",
+            "action",
+            "ip",
+            "location",
+            "created_at",
+        )
+        interfaces = (graphene.relay.Node,)
+
+    user_id = graphene.UUID()
+
+    @classmethod
+    @user_passes_test(lambda user: user.is_authenticated and user.is_admin)
+    def get_node(cls, info: ResolveInfo, id):
+        return cls._meta.model.objects.filter(pk=id).first()
+
+    @staticmethod
+    def resolve_user_id(root: Log, info: ResolveInfo):
+        return root.user_id
+
+
+class LogConnection(graphene.relay.Connection):
+    class Meta:
+        node = LogNode
@@ -0,0 +1,13 @@
+import graphene
+
+from log.graphql.dashboard.log import LogQuery
+
+
+class Query(
+    LogQuery,
+    graphene.ObjectType,
+):
+    pass
+
+
+schema = graphene.Schema(query=Query)
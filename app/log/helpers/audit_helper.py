@@ -0,0 +1,216 @@
+from collections import defaultdict
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import List
+import atexit
+import json
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from django_tenants.utils import schema_context
+
+from log.models import Log, LogDetail
+
+logger = logging.getLogger(__name__)
+
+LOG_FIELDS = ("id", "user_id", "action", "ip", "location")
+DETAIL_FIELDS = ("header", "request", "variables", "response")
+
+
+def format_location(location) -> str:
+    if not location:
+        return None
+    elif isinstance(location, str):
+        return location[:255]
+
+    return ", ".join(
+        filter(
+            None,
+            (
+                location.get("city"),
+                location.get("region"),
+                location.get("country_name"),
+            ),
+        )
+    )[:255]
+
+
+class AuditLogWriter:
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        fallback_path: str = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fallback_path = fallback_path
+        self.queue = Queue(maxsize=max_size)
+        self.counters = {"queued": 0, "written": 0, "dropped": 0, "failed": 0}
+        self.lock = Lock()
+        self.thread = None
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += value
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {**self.counters, "buffered": self.queue.qsize()}
+
+    def start(self) -> None:
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(target=self.run, name="audit-log", daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)
+
+    def write(
+        self, schema_name: str, user_id, action: str, ip=None, location=None, **detail
+    ) -> bool:
+        self.start()
+
+        event = {
+            "schema_name": schema_name,
+            "id": str(uuid.uuid4()),
+            "user_id": str(user_id),
+            "action": action,
+            "ip": ip,
+            # Resolved on the writer thread, lazy locations included
+            "location": location,
+            "detail": detail or None,
+            "created_at": timezone.now(),
+        }
+        try:
+            self.queue.put_nowait(event)
+        except Full:
+            self.count("dropped")
+            return False
+
+        self.count("queued")
+
+        return True
+
+    def run(self) -> None:
+        while True:
+            events = self.drain(block=True)
+            if events:
+                self.save(events)
+                close_old_connections()
+
+    def drain(self, block: bool = False) -> List[dict]:
+        events = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(events) < self.batch_size:
+            try:
+                if block:
+                    timeout = max(deadline - time.monotonic(), 0)
+                    events.append(self.queue.get(timeout=timeout))
+                else:
+                    events.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        return events
+
+    def flush(self) -> None:
+        while events := self.drain():
+            self.save(events)
+
+    def save(self, events: List[dict]) -> None:
+        batches = defaultdict(list)
+        for event in events:
+            event["location"] = format_location(event["location"])
+            batches[event["schema_name"]].append(event)
+
+        for schema_name, batch in batches.items():
+            try:
+                self.save_batch(schema_name, batch)
+            except Exception:
+                logger.exception("Can not write %s audit logs.", len(batch))
+                self.count("failed", len(batch))
+                self.write_fallback(batch)
+            else:
+                self.count("written", len(batch))
+
+    def insert(self, model, rows: list, ignore_conflicts: bool = False) -> None:
+        if not rows:
+            return
+
+        # Raw inserts skip auto_now_add, rows keep the time they were written
+        model._base_manager._insert(
+            rows,
+            fields=model._meta.concrete_fields,
+            raw=True,
+            on_conflict=OnConflict.IGNORE if ignore_conflicts else None,
+        )
+
+    def save_batch(
+        self, schema_name: str, batch: List[dict], ignore_conflicts: bool = False
+    ) -> None:
+        logs = []
+        details = []
+        for event in batch:
+            # Fallback files written before created_at was captured lack it
+            created_at = event.get("created_at") or timezone.now()
+            logs.append(
+                Log(
+                    **{field: event.get(field) for field in LOG_FIELDS},
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+            if event["detail"]:
+                # The detail shares the log id, so a replay can not duplicate it
+                details.append(
+                    LogDetail(
+                        id=event["id"],
+                        log_id=event["id"],
+                        created_at=created_at,
+                        updated_at=created_at,
+                        **event["detail"],
+                    )
+                )
+
+        with schema_context(schema_name), transaction.atomic():
+            self.insert(Log, logs, ignore_conflicts=ignore_conflicts)
+            self.insert(LogDetail, details, ignore_conflicts=ignore_conflicts)
+
+    def write_fallback(self, batch: List[dict]) -> None:
+        if not self.fallback_path:
+            return
+
+        try:
+            with open(self.fallback_path, "a", encoding="utf-8") as file:
+                for event in batch:
+                    file.write(json.dumps(event, default=str) + "\n")
+        except OSError:
+            logger.exception("Can not write the audit log fallback.")
+
+    def replay_fallback(self) -> int:
+        with open(self.fallback_path, encoding="utf-8") as file:
+            events = [json.loads(line) for line in file if line.strip()]
+
+        batches = defaultdict(list)
+        for event in events:
+            batches[event["schema_name"]].append(event)
+
+        # Rows keep their id and created_at, so a rerun after a failure skips
+        # the batches that were already written
+        for schema_name, batch in batches.items():
+            self.save_batch(schema_name, batch, ignore_conflicts=True)
+
+        open(self.fallback_path, "w").close()
+
+        return len(events)
+
+
+audit_log_writer = AuditLogWriter(**settings.AUDIT_LOG)
@@ -0,0 +1,218 @@
+from datetime import date
+from typing import Iterable, Iterator, List
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from log.models import Log, LogDetail
+
+PARTITIONED_TABLES = (Log._meta.db_table, LogDetail._meta.db_table)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_months(start: date, end: date) -> Iterator[date]:
+    month = start.replace(day=1)
+
+    while month <= end:
+        yield month
+        month = add_months(month, 1)
+
+
+def get_partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+        [f'"{table}"'],
+    )
+    row = cursor.fetchone()
+
+    return row is not None and row[0] == "p"
+
+
+def get_partitions(cursor, table: str) -> List[str]:
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits"
+        " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+        " WHERE pg_inherits.inhparent = to_regclass(%s)",
+        [f'"{table}"'],
+    )
+
+    return [row[0] for row in cursor.fetchall()]
+
+
+def get_default_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def create_partition(cursor, table: str, month: date) -> None:
+    name = get_partition_name(table, month)
+    default = get_default_name(table)
+    bounds = [f"{month} 00:00:00+00", f"{add_months(month, 1)} 00:00:00+00"]
+
+    # Postgres refuses a new range while the DEFAULT partition holds rows in
+    # it, so the default is detached and its rows for the month moved over
+    has_default = default in get_partitions(cursor, table)
+    if has_default:
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{name}"'
+        f' PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+        bounds,
+    )
+
+    if has_default:
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{default}"'
+            " WHERE created_at >= %s AND created_at < %s RETURNING *)"
+            f' INSERT INTO "{name}" SELECT * FROM moved',
+            bounds,
+        )
+        cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+
+
+def partition_table(
+    cursor, table: str, partitioned_tables: Iterable[str] = PARTITIONED_TABLES
+) -> None:
+    # Turn a plain table into one range partitioned by month on created_at.
+    # Primary and unique keys must include created_at, so the primary key
+    # becomes (id, created_at), unique indexes become plain ones and foreign
+    # keys to other partitioned tables are dropped.
+    original = table + "_unpartitioned"
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{original}"')
+
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes"
+        " WHERE schemaname = current_schema() AND tablename = %s"
+        " AND indexname NOT IN ("
+        "  SELECT conname FROM pg_constraint"
+        "  WHERE conrelid = to_regclass(%s) AND contype = 'p'"
+        " )",
+        [original, f'"{original}"'],
+    )
+    indexes = [
+        indexdef.replace(f".{original} ", f".{table} ").replace(
+            "CREATE UNIQUE INDEX", "CREATE INDEX"
+        )
+        for indexdef, in cursor.fetchall()
+    ]
+
+    cursor.execute(
+        "SELECT con.conname, pg_get_constraintdef(con.oid), ref.relname"
+        " FROM pg_constraint con"
+        " JOIN pg_class ref ON ref.oid = con.confrelid"
+        " WHERE con.conrelid = to_regclass(%s) AND con.contype = 'f'",
+        [f'"{original}"'],
+    )
+    foreign_keys = [
+        (name, definition)
+        for name, definition, referenced in cursor.fetchall()
+        if referenced not in partitioned_tables
+        and not referenced.endswith("_unpartitioned")
+    ]
+
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{original}" INCLUDING DEFAULTS)'
+        " PARTITION BY RANGE (created_at)"
+    )
+
+    cursor.execute(f'SELECT min(created_at) FROM "{original}"')
+    first = cursor.fetchone()[0]
+    today = timezone.now().date()
+    first = first.date() if first else today
+    months = list(get_months(first, add_months(today, 1)))
+    for month in months:
+        create_partition(cursor, table, month)
+    # Catches rows outside the created months, e.g. replayed or future ones
+    cursor.execute(
+        f'CREATE TABLE "{get_default_name(table)}" PARTITION OF "{table}" DEFAULT'
+    )
+
+    # Copied a month at a time, each statement fills a single partition
+    for month in months:
+        cursor.execute(
+            f'INSERT INTO "{table}" SELECT * FROM "{original}"'
+            " WHERE created_at >= %s AND created_at < %s",
+            [f"{month} 00:00:00+00", f"{add_months(month, 1)} 00:00:00+00"],
+        )
+    cursor.execute(
+        f'INSERT INTO "{table}" SELECT * FROM "{original}" WHERE created_at >= %s',
+        [f"{add_months(months[-1], 1)} 00:00:00+00"],
+    )
+    cursor.execute(f'DROP TABLE "{original}" CASCADE')
+
+    cursor.execute(
+        f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey"'
+        " PRIMARY KEY (id, created_at)"
+    )
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def repair_partitions() -> None:
+    # Schema cloning copies partitioned tables as plain ones
+    with connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(cursor, table):
+                continue
+
+            pattern = re.compile(rf"^{table}_(p\d{{4}}_\d{{2}}|default)$")
+            cursor.execute(
+                "SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+            )
+            for (name,) in cursor.fetchall():
+                if pattern.match(name):
+                    cursor.execute(f'DROP TABLE "{name}"')
+
+            partition_table(cursor, table)
+
+
+def create_partitions(months_ahead: int) -> List[str]:
+    created = []
+    today = timezone.now().date()
+
+    with connection.cursor() as cursor, transaction.atomic():
+        for table in PARTITIONED_TABLES:
+            existing = get_partitions(cursor, table)
+
+            for month in get_months(today, add_months(today, months_ahead)):
+                name = get_partition_name(table, month)
+                if name not in existing:
+                    create_partition(cursor, table, month)
+                    created.append(name)
+
+    return created
+
+
+def drop_partitions(months: int) -> List[str]:
+    dropped = []
+    cutoff_month = add_months(timezone.now().date(), -months)
+    cutoff = get_partition_name("", cutoff_month)
+
+    with connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            # Rows that landed in the default partition expire as well
+            if get_default_name(table) in get_partitions(cursor, table):
+                cursor.execute(
+                    f'DELETE FROM "{get_default_name(table)}" WHERE created_at < %s',
+                    [f"{cutoff_month} 00:00:00+00"],
+                )
+
+            for name in get_partitions(cursor, table):
+                suffix = name[len(table) :]
+                if re.match(r"^_p\d{4}_\d{2}$", suffix) and suffix < cutoff:
+                    cursor.execute(f'DROP TABLE "{name}"')
+                    dropped.append(name)
+
+    return dropped
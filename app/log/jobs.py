@@ -0,0 +1,11 @@
+from django.conf import settings
+
+from log.helpers.partition_helper import create_partitions, drop_partitions
+from tenant.helpers.job_helper import job_handler
+from tenant.models import Job, Task
+
+
+@job_handler("log_partition_maintenance")
+def maintain_log_partitions(job: Job, task: Task):
+    create_partitions(settings.LOG_PARTITIONS["months_ahead"])
+    drop_partitions(settings.LOG_PARTITIONS["retention_months"])
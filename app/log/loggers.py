@@ -0,0 +1,45 @@
+import json
+
+from django.db import connection
+from django.http.request import HttpRequest
+
+from graphql.execution import ExecutionResult
+
+from core.loggers import (
+    GraphQLRequestLogger,
+    format_result,
+    get_headers,
+    redact,
+    redact_query,
+)
+from log.helpers.audit_helper import audit_log_writer
+
+
+class AuditGraphQLRequestLogger(GraphQLRequestLogger):
+    def log(
+        self,
+        request: HttpRequest,
+        data: dict,
+        query: str,
+        variables: dict,
+        operation_name: str,
+        result: ExecutionResult,
+        duration: float,
+    ) -> None:
+        super().log(request, data, query, variables, operation_name, result, duration)
+
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return
+
+        audit_log_writer.write(
+            schema_name=connection.schema_name,
+            user_id=user.id,
+            action="graphql:" + (operation_name or "anonymous"),
+            ip=getattr(request, "user_ip", None),
+            location=getattr(request, "user_location", None),
+            header=json.dumps(get_headers(request)),
+            request=redact_query(query),
+            variables=redact(variables),
+            response=redact(format_result(result)),
+        )
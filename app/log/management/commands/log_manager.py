@@ -0,0 +1,92 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from django_tenants.utils import schema_context, schema_exists
+
+from log.helpers.audit_helper import audit_log_writer
+from log.helpers.partition_helper import create_partitions, drop_partitions
+from tenant.models import PooledSchema, Tenant
+
+
+class Command(BaseCommand):
+    help = "Log Manager"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-r",
+            "--replay",
+            action="store_true",
+            help="Write the audit log fallback file to the database.",
+        )
+        parser.add_argument(
+            "-p",
+            "--partition",
+            action="store_true",
+            help="Create the upcoming monthly log partitions in every schema.",
+        )
+        parser.add_argument(
+            "--retention",
+            action="store_true",
+            help="Drop log partitions older than the retention in every schema.",
+        )
+
+        parser.add_argument(
+            "--months_ahead",
+            type=int,
+            default=settings.LOG_PARTITIONS["months_ahead"],
+            help="Specify the number of months to create partitions for.",
+        )
+        parser.add_argument(
+            "--retention_months",
+            type=int,
+            default=settings.LOG_PARTITIONS["retention_months"],
+            help="Specify the number of months to keep.",
+        )
+
+    def handle(self, *args, **options):
+        if options.get("r") or options.get("replay"):
+            if os.path.exists(audit_log_writer.fallback_path):
+                count = audit_log_writer.replay_fallback()
+
+                self.stdout.write(
+                    self.style.SUCCESS(f"Successfully replay {count} audit logs!")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS("No audit logs to replay."))
+
+        elif options.get("p") or options.get("partition"):
+            for schema_name in self.get_schema_names():
+                with schema_context(schema_name):
+                    created = create_partitions(options.get("months_ahead"))
+
+                for name in created:
+                    self.stdout.write(f"{schema_name}: created {name}")
+
+            self.stdout.write(self.style.SUCCESS("Successfully create partitions!"))
+
+        elif options.get("retention"):
+            for schema_name in self.get_schema_names():
+                with schema_context(schema_name):
+                    dropped = drop_partitions(options.get("retention_months"))
+
+                for name in dropped:
+                    self.stdout.write(f"{schema_name}: dropped {name}")
+
+            self.stdout.write(self.style.SUCCESS("Successfully drop partitions!"))
+
+        else:
+            self.stdout.write(self.style.ERROR("Please provide the correct option."))
+
+    def get_schema_names(self):
+        schema_names = list(
+            Tenant.objects.exclude(schema_name=settings.PUBLIC_SCHEMA_NAME).values_list(
+                "schema_name", flat=True
+            )
+        )
+        schema_names += PooledSchema.objects.values_list("schema_name", flat=True)
+        if schema_exists(settings.TENANT_PROVISIONING["template_schema"]):
+            schema_names.append(settings.TENANT_PROVISIONING["template_schema"])
+
+        return schema_names
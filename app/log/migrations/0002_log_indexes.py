@@ -0,0 +1,34 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("log", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="log",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="log",
+            index=models.Index(
+                fields=["user", "created_at"], name="log_log_user_id_8bb951_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="log",
+            index=models.Index(
+                fields=["action", "created_at"], name="log_log_action_c0f2ee_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="log",
+            index=models.Index(
+                fields=["created_at", "id"], name="log_log_created_11382e_idx"
+            ),
+        ),
+    ]
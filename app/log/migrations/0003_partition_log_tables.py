@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from log.helpers.partition_helper import partition_table
+
+
+def partition_tables(apps, schema_editor):
+    tables = [
+        apps.get_model("log", model_name)._meta.db_table
+        for model_name in ("Log", "LogDetail")
+    ]
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in tables:
+            partition_table(cursor, table, tables)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("log", "0002_log_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
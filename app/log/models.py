@@ -13,6 +13,14 @@ class Log(CommonDateAndSafeDeleteMixin):
     ip = models.GenericIPAddressField(db_index=True, null=True)
     location = models.CharField(max_length=255, db_index=True, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["action", "created_at"]),
+            models.Index(fields=["created_at", "id"]),
+        ]
+        ordering = ["-created_at", "-id"]
+
     def __str__(self):
         return str(self.id)
 
@@ -0,0 +1,269 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+import os
+import tempfile
+import uuid
+
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase
+from django.utils import timezone
+
+from django_tenants.test.cases import TenantTestCase
+from graphql import GraphQLError
+from graphql_relay import to_global_id
+from graphql.execution import ExecutionResult
+
+from account.models import User
+from log.graphql.schema_dashboard import schema
+from log.helpers.audit_helper import AuditLogWriter
+from log.helpers.partition_helper import (
+    add_months,
+    create_partition,
+    get_default_name,
+    get_partition_name,
+    get_partitions,
+)
+from core.loggers import REDACTED
+from log.loggers import AuditGraphQLRequestLogger
+from log.models import Log, LogDetail
+
+
+def create_log(user: User, created_at) -> Log:
+    log_id = str(uuid.uuid4())
+    AuditLogWriter().save_batch(
+        connection.schema_name,
+        [
+            {
+                "id": log_id,
+                "user_id": user.id,
+                "action": "signin_success",
+                "ip": None,
+                "location": None,
+                "detail": None,
+                "created_at": created_at,
+            }
+        ],
+    )
+
+    return Log.objects.get(pk=log_id)
+
+
+def get_partition(log: Log) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT tableoid::regclass::text FROM "{Log._meta.db_table}"'
+            " WHERE id = %s",
+            [log.id],
+        )
+
+        return cursor.fetchone()[0].strip('"')
+
+
+class AuditGraphQLRequestLoggerTestCase(SimpleTestCase):
+    def log(self, query: str, variables: dict, result: ExecutionResult) -> dict:
+        request = RequestFactory().post("/dashboard/")
+        request.user = mock.Mock(id="1", is_authenticated=True)
+
+        with mock.patch("log.loggers.audit_log_writer") as audit_log_writer:
+            AuditGraphQLRequestLogger(sample_rate=0).log(
+                request, {}, query, variables, "changePassword", result, 0.1
+            )
+
+        return audit_log_writer.write.call_args.kwargs
+
+    def test_sensitive_variables_are_redacted(self):
+        detail = self.log(
+            "mutation changePassword($oldPassword: String!, $newPassword: String!)"
+            " { changePassword(oldPassword: $oldPassword, newPassword: $newPassword)"
+            " { success } }",
+            {"oldPassword": "old-secret", "newPassword": "new-secret", "id": "1"},
+            ExecutionResult(data={"changePassword": {"success": True}}),
+        )
+
+        self.assertEqual(
+            detail["variables"],
+            {"oldPassword": REDACTED, "newPassword": REDACTED, "id": "1"},
+        )
+
+    def test_inline_literals_and_tokens_are_redacted(self):
+        detail = self.log(
+            'mutation { tokenAuth(email: "user@example.com", password: "secret")'
+            " { token refreshToken } }",
+            None,
+            ExecutionResult(
+                data={"tokenAuth": {"token": "jwt", "refreshToken": "refresh"}}
+            ),
+        )
+
+        self.assertNotIn("secret", detail["request"])
+        self.assertIn("user@example.com", detail["request"])
+        self.assertEqual(
+            detail["response"],
+            {"data": {"tokenAuth": {"token": REDACTED, "refreshToken": REDACTED}}},
+        )
+
+    def test_response_accepts_processed_errors(self):
+        detail = self.log(
+            "{ me { id } }",
+            None,
+            ExecutionResult(data=None, errors=["Can not find this user!"]),
+        )
+
+        self.assertEqual(
+            detail["response"],
+            {"data": None, "errors": [{"message": "Can not find this user!"}]},
+        )
+
+    def test_invalid_query_is_kept(self):
+        detail = self.log(
+            "{ me {", None, ExecutionResult(data=None, errors=[GraphQLError("Syntax")])
+        )
+
+        self.assertEqual(detail["request"], "{ me {")
+
+
+class AuditLogWriterTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            endpoint="dashboard", email="user@example.com", username="user"
+        )
+        file, self.fallback_path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(file)
+        self.addCleanup(os.remove, self.fallback_path)
+        self.audit_log_writer = AuditLogWriter(fallback_path=self.fallback_path)
+
+    def get_event(self, created_at) -> dict:
+        # Queue the event without starting the writer thread
+        with mock.patch.object(self.audit_log_writer, "start"):
+            self.audit_log_writer.write(
+                schema_name=self.tenant.schema_name,
+                user_id=self.user.id,
+                action="signin_success",
+                request="{ me { id } }",
+            )
+
+        event = self.audit_log_writer.drain()[0]
+        event["created_at"] = created_at
+
+        return event
+
+    def test_created_at_is_captured_at_write_time(self):
+        created_at = timezone.now() - timedelta(days=1)
+
+        self.audit_log_writer.save([self.get_event(created_at)])
+
+        log = Log.objects.get()
+        self.assertEqual(log.created_at, created_at)
+        self.assertEqual(LogDetail.objects.get(log_id=log.id).created_at, created_at)
+
+    def test_replay_skips_rows_that_were_already_written(self):
+        event = self.get_event(timezone.now() - timedelta(hours=1))
+        self.audit_log_writer.write_fallback([dict(event), dict(event)])
+        # A previous replay wrote the batch and died before clearing the file
+        self.audit_log_writer.save_batch(self.tenant.schema_name, [dict(event)])
+
+        count = self.audit_log_writer.replay_fallback()
+
+        self.assertEqual(count, 2)
+        self.assertEqual(Log.objects.count(), 1)
+        self.assertEqual(LogDetail.objects.count(), 1)
+        with open(self.fallback_path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "")
+
+
+class PartitionHelperTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            endpoint="dashboard", email="user@example.com", username="user"
+        )
+        self.table = Log._meta.db_table
+
+    def test_rows_are_routed_to_their_month(self):
+        now = timezone.now()
+
+        log = create_log(self.user, now)
+
+        self.assertEqual(
+            get_partition(log),
+            get_partition_name(self.table, now.date().replace(day=1)),
+        )
+
+    def test_default_rows_move_to_a_new_partition(self):
+        month = add_months(timezone.now().date(), 24)
+        log = create_log(
+            self.user, datetime(month.year, month.month, 15, tzinfo=dt_timezone.utc)
+        )
+        self.assertEqual(get_partition(log), get_default_name(self.table))
+
+        with connection.cursor() as cursor:
+            create_partition(cursor, self.table, month)
+            partitions = get_partitions(cursor, self.table)
+
+        self.assertEqual(get_partition(log), get_partition_name(self.table, month))
+        self.assertIn(get_default_name(self.table), partitions)
+
+
+class LogQueryTestCase(TenantTestCase):
+    query = "query ($id: ID!) { log(id: $id) { id action } }"
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        self.user = User.objects.create(
+            endpoint="dashboard", email="user@example.com", username="user"
+        )
+        self.log = create_log(self.user, timezone.now())
+
+    def execute(self, is_admin: bool):
+        request = RequestFactory().post("/dashboard/")
+        request.user = mock.Mock(is_authenticated=True, is_admin=is_admin)
+
+        return schema.execute(
+            self.query,
+            variable_values={"id": to_global_id("LogNode", self.log.id)},
+            context_value=request,
+        )
+
+    def test_log_node_requires_an_admin(self):
+        result = self.execute(is_admin=False)
+
+        self.assertIsNone(result.data["log"])
+        self.assertTrue(result.errors)
+
+    def test_log_node_is_resolved_for_an_admin(self):
+        result = self.execute(is_admin=True)
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["log"]["action"], "signin_success")
+
+    def test_logs_are_paginated_by_cursor(self):
+        create_log(self.user, timezone.now() - timedelta(minutes=1))
+        request = RequestFactory().post("/dashboard/")
+        request.user = mock.Mock(is_authenticated=True, is_admin=True)
+        query = (
+            "query ($after: String) { logs(first: 1, after: $after)"
+            " { edges { node { id } } pageInfo { endCursor hasNextPage } } }"
+        )
+
+        first = schema.execute(query, context_value=request).data["logs"]
+        second = schema.execute(
+            query,
+            variable_values={"after": first["pageInfo"]["endCursor"]},
+            context_value=request,
+        ).data["logs"]
+
+        self.assertTrue(first["pageInfo"]["hasNextPage"])
+        self.assertFalse(second["pageInfo"]["hasNextPage"])
+        self.assertNotEqual(
+            first["edges"][0]["node"]["id"], second["edges"][0]["node"]["id"]
+        )
@@ -11,6 +11,7 @@ from graphene_django import DjangoListField, DjangoObjectType
 from graphql_jwt.decorators import login_required
 import graphene
 
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from core.types import TransTypeInput
 from organization.models import Organization, OrganizationTrans
@@ -88,7 +89,7 @@ class OrganizationNode(DjangoObjectType):
         interfaces = (graphene.relay.Node,)
         connection_class = ExtendedConnection
 
-    translation = graphene.Field(OrganizationTransType)
+    translation = graphene.Field(OrganizationTransType, language_code=graphene.String())
     translations = DjangoListField(OrganizationTransType)
 
     @classmethod
@@ -107,12 +108,20 @@ class OrganizationNode(DjangoObjectType):
         return organization
 
     @staticmethod
-    def resolve_translation(root: Organization, info: ResolveInfo):
-        return root.translations.filter(language_code=root.language_code).first()
+    @optimizer_hints(only=("language_code",))
+    def resolve_translation(
+        root: Organization, info: ResolveInfo, language_code: str = None
+    ):
+        return (
+            info.context.loaders.translations_by_organization_loader.load_translation(
+                root, language_code
+            )
+        )
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_translations(root: Organization, info: ResolveInfo):
-        return root.translations
+        return info.context.loaders.translations_by_organization_loader.load(root.id)
 
 
 class OrganizationConnection(graphene.relay.Connection):
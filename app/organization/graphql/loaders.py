@@ -0,0 +1,15 @@
+from core.loaders import TranslationLoader, ValueLoader, register_loader
+from organization.models import Organization, OrganizationTrans
+
+register_loader(
+    "language_code_by_organization_loader",
+    lambda loaders: ValueLoader(
+        loaders, Organization, "id", "language_code", parent=Organization
+    ),
+)
+register_loader(
+    "translations_by_organization_loader",
+    lambda loaders: TranslationLoader(
+        loaders, OrganizationTrans, "organization_id", parent=Organization
+    ),
+)
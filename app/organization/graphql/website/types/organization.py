@@ -10,6 +10,7 @@ from graphene import ResolveInfo
 from graphene_django import DjangoListField, DjangoObjectType
 import graphene
 
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from organization.models import Organization, OrganizationTrans
 
@@ -77,7 +78,7 @@ class OrganizationNode(DjangoObjectType):
         interfaces = (graphene.relay.Node,)
         connection_class = ExtendedConnection
 
-    translation = graphene.Field(OrganizationTransType)
+    translation = graphene.Field(OrganizationTransType, language_code=graphene.String())
     translations = DjangoListField(OrganizationTransType)
     is_visible = graphene.Boolean()
 
@@ -98,14 +99,23 @@ class OrganizationNode(DjangoObjectType):
         return None
 
     @staticmethod
-    def resolve_translation(root: Organization, info: ResolveInfo):
-        return root.translations.filter(language_code=root.language_code).first()
+    @optimizer_hints(only=("language_code",))
+    def resolve_translation(
+        root: Organization, info: ResolveInfo, language_code: str = None
+    ):
+        return (
+            info.context.loaders.translations_by_organization_loader.load_translation(
+                root, language_code
+            )
+        )
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_translations(root: Organization, info: ResolveInfo):
-        return root.translations
+        return info.context.loaders.translations_by_organization_loader.load(root.id)
 
     @staticmethod
+    @optimizer_hints(only=("is_published", "published_at"))
     def resolve_is_visible(root: Organization, info: ResolveInfo):
         return root.is_visible
 
@@ -10,26 +10,36 @@ from account.models import User
 from account.services.user_service import UserService
 from organization.models import Organization, OrganizationTrans
 from role.services.role_service import RoleService
+from tenant.helpers.schema_helper import SchemaHelper
 
 
 class OrganizationService:
     @transaction.atomic
     def initiate_schema(
-        self, schema_name: str, organization_name: str, email: str, password: str
+        self,
+        schema_name: str,
+        organization_name: str,
+        email: str,
+        password: str,
+        strategy: str = None,
     ) -> Tuple[bool, Organization, User]:
+        schema_helper = SchemaHelper(strategy=strategy)
+        schema_helper.ensure_schema(schema_name)
+
         with schema_context(schema_name):
-            organization = Organization(
-                schema_name=schema_name,
-            )
-            organization.save()
+            # Pooled schemas come with the organization already seeded
+            organization = Organization.objects.filter(schema_name=schema_name).first()
+            if organization:
+                result = True
+            else:
+                organization, result = self.prepare_organization(schema_name)
+
             OrganizationTrans.objects.create(
                 organization=organization,
                 language_code=organization.language_code,
                 name=organization_name,
             )
 
-            result = self.init_default_data(organization)
-
             if result:
                 user_service = UserService()
                 result, user = user_service.create_user(
@@ -51,6 +61,23 @@ class OrganizationService:
                 organization.delete(force_policy=HARD_DELETE)
                 return result, None, None
 
+    @transaction.atomic
+    def prepare_schema(self, schema_name: str) -> bool:
+        with schema_context(schema_name):
+            _, result = self.prepare_organization(schema_name)
+
+        return result
+
+    def prepare_organization(self, schema_name: str) -> Tuple[Organization, bool]:
+        organization = Organization(
+            schema_name=schema_name,
+        )
+        organization.save()
+
+        result = self.init_default_data(organization)
+
+        return organization, result
+
     @transaction.atomic
     def init_default_data(self, organization: Organization) -> bool:
         role_service = RoleService()
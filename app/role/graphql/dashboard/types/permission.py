@@ -9,6 +9,7 @@ from graphene import ResolveInfo
 from graphene_django import DjangoListField, DjangoObjectType
 import graphene
 
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from core.types import TransTypeInput
 from role.models import Permission, PermissionTrans
@@ -84,7 +85,7 @@ class PermissionNode(DjangoObjectType):
         interfaces = (graphene.relay.Node,)
         connection_class = ExtendedConnection
 
-    translation = graphene.Field(PermissionTransType)
+    translation = graphene.Field(PermissionTransType, language_code=graphene.String())
     translations = DjangoListField(PermissionTransType)
 
     @classmethod
@@ -96,14 +97,18 @@ class PermissionNode(DjangoObjectType):
         return cls._meta.model.objects.filter(pk=id).first()
 
     @staticmethod
-    def resolve_translation(root: Permission, info: ResolveInfo):
-        return root.translations.filter(
-            language_code=root.organization.language_code
-        ).first()
+    @optimizer_hints(only=("organization",))
+    def resolve_translation(
+        root: Permission, info: ResolveInfo, language_code: str = None
+    ):
+        return info.context.loaders.translations_by_permission_loader.load_translation(
+            root, language_code
+        )
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_translations(root: Permission, info: ResolveInfo):
-        return root.translations
+        return info.context.loaders.translations_by_permission_loader.load(root.id)
 
 
 class PermissionConnection(graphene.relay.Connection):
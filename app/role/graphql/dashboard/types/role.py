@@ -9,6 +9,7 @@ from graphene import ResolveInfo
 from graphene_django import DjangoListField, DjangoObjectType
 import graphene
 
+from core.optimizer import optimizer_hints
 from core.relay.connection import ExtendedConnection
 from core.types import TransTypeInput
 from role.graphql.dashboard.types.permission import PermissionType
@@ -86,7 +87,7 @@ class RoleNode(DjangoObjectType):
         connection_class = ExtendedConnection
 
     permissions = DjangoListField(PermissionType)
-    translation = graphene.Field(RoleTransType)
+    translation = graphene.Field(RoleTransType, language_code=graphene.String())
     translations = DjangoListField(RoleTransType)
 
     @classmethod
@@ -98,14 +99,16 @@ class RoleNode(DjangoObjectType):
         return cls._meta.model.objects.filter(pk=id).first()
 
     @staticmethod
-    def resolve_translation(root: Role, info: ResolveInfo):
-        return root.translations.filter(
-            language_code=root.organization.language_code
-        ).first()
+    @optimizer_hints(only=("organization",))
+    def resolve_translation(root: Role, info: ResolveInfo, language_code: str = None):
+        return info.context.loaders.translations_by_role_loader.load_translation(
+            root, language_code
+        )
 
     @staticmethod
+    @optimizer_hints(only=())
     def resolve_translations(root: Role, info: ResolveInfo):
-        return root.translations
+        return info.context.loaders.translations_by_role_loader.load(root.id)
 
 
 class RoleConnection(graphene.relay.Connection):
@@ -0,0 +1,23 @@
+from core.loaders import TranslationLoader, register_loader
+from role.models import Permission, PermissionTrans, Role, RoleTrans
+
+register_loader(
+    "translations_by_permission_loader",
+    lambda loaders: TranslationLoader(
+        loaders,
+        PermissionTrans,
+        "permission_id",
+        parent=Permission,
+        organization_attr="organization_id",
+    ),
+)
+register_loader(
+    "translations_by_role_loader",
+    lambda loaders: TranslationLoader(
+        loaders,
+        RoleTrans,
+        "role_id",
+        parent=Role,
+        organization_attr="organization_id",
+    ),
+)
@@ -1,8 +1,9 @@
-from typing import Type
+from typing import Iterable, Type
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from core.graphql_jwt.cache import invalidate_user_snapshots_on_commit
 from organization.models import Organization
 from role import ProtectedRole
 from role.models import Role
@@ -10,126 +11,130 @@ from role.services.permission_service import PermissionService
 
 
 class RoleService:
+    def __init__(self):
+        self.role_ids = {}
+
+    def get_role_ids(self, organization: Organization, slugs: Iterable[str]) -> list:
+        slugs = list(slugs)
+        role_ids = self.role_ids.setdefault(organization.id, {})
+
+        missing = set(slugs) - role_ids.keys()
+        if missing:
+            role_ids.update(
+                Role.objects.filter(
+                    organization=organization, slug__in=missing
+                ).values_list("slug", "id")
+            )
+            if not missing <= role_ids.keys():
+                raise Role.DoesNotExist
+
+        return [role_ids[slug] for slug in slugs]
+
     @transaction.atomic
+    def assign_roles(
+        self,
+        organization: Organization,
+        users: Iterable[Type[get_user_model()]],
+        slugs: Iterable[str],
+    ) -> list:
+        users = list(users)
+        slugs = list(slugs)
+        role_ids = self.get_role_ids(organization, slugs)
+
+        Through = get_user_model().roles.through
+        Through.objects.bulk_create(
+            [
+                Through(user_id=user.id, role_id=role_id)
+                for user in users
+                for role_id in role_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+        # bulk_create skips m2m_changed, so mirror account.receivers here
+        for user in users:
+            user.clear_role_cache()
+        invalidate_user_snapshots_on_commit(
+            (user.endpoint, user.email) for user in users
+        )
+
+        return users
+
     def assign_admin(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_admin = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Admin
-        )
-        role_manager = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Manager
-        )
-        role_staff = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Staff
+        self.assign_roles(
+            organization,
+            [user],
+            [ProtectedRole.Admin, ProtectedRole.Manager, ProtectedRole.Staff],
         )
-        user.roles.add(role_admin)
-        user.roles.add(role_manager)
-        user.roles.add(role_staff)
 
         return user
 
-    @transaction.atomic
     def assign_collaborator(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_collaborator = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Collaborator
-        )
-        user.roles.add(role_collaborator)
+        self.assign_roles(organization, [user], [ProtectedRole.Collaborator])
 
         return user
 
-    @transaction.atomic
     def assign_customer(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_customer = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Customer
-        )
-        user.roles.add(role_customer)
+        self.assign_roles(organization, [user], [ProtectedRole.Customer])
 
         return user
 
-    @transaction.atomic
     def assign_hq_user(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_hq_user = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.HQUser
-        )
-        user.roles.add(role_hq_user)
+        self.assign_roles(organization, [user], [ProtectedRole.HQUser])
 
         return user
 
-    @transaction.atomic
     def assign_manager(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_manager = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Manager
+        self.assign_roles(
+            organization, [user], [ProtectedRole.Manager, ProtectedRole.Staff]
         )
-        role_staff = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Staff
-        )
-        user.roles.add(role_manager)
-        user.roles.add(role_staff)
 
         return user
 
-    @transaction.atomic
     def assign_member(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_member = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Member
-        )
-        user.roles.add(role_member)
+        self.assign_roles(organization, [user], [ProtectedRole.Member])
 
         return user
 
-    @transaction.atomic
     def assign_owner(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_admin = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Admin
-        )
-        role_manager = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Manager
-        )
-        role_owner = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Owner
+        self.assign_roles(
+            organization,
+            [user],
+            [
+                ProtectedRole.Admin,
+                ProtectedRole.Manager,
+                ProtectedRole.Owner,
+                ProtectedRole.Staff,
+            ],
         )
-        role_staff = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Staff
-        )
-        user.roles.add(role_admin)
-        user.roles.add(role_manager)
-        user.roles.add(role_owner)
-        user.roles.add(role_staff)
 
         return user
 
-    @transaction.atomic
     def assign_partner(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_partner = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Partner
-        )
-        user.roles.add(role_partner)
+        self.assign_roles(organization, [user], [ProtectedRole.Partner])
 
         return user
 
-    @transaction.atomic
     def assign_staff(
         self, organization: Organization, user: Type[get_user_model()]
     ) -> Type[get_user_model()]:
-        role_staff = Role.objects.only("id").get(
-            organization=organization, slug=ProtectedRole.Staff
-        )
-        user.roles.add(role_staff)
+        self.assign_roles(organization, [user], [ProtectedRole.Staff])
 
         return user
 
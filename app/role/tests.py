@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from django_tenants.test.cases import TenantTestCase
+
+from account.models import User
+from core.graphql_jwt.cache import CACHE_KEY_PREFIX, _get_identity
+from organization.models import Organization
+from role import ProtectedRole
+from role.models import Role
+from role.services.role_service import RoleService
+
+
+class RoleServiceTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            schema_name=self.tenant.schema_name
+        )
+        for slug in (ProtectedRole.Manager, ProtectedRole.Staff):
+            Role.objects.create(organization=self.organization, slug=slug)
+        self.user = User.objects.create(
+            endpoint="dashboard", email="user@example.com", username="user"
+        )
+
+    def test_assign_roles_accepts_a_generator(self):
+        slugs = (slug for slug in (ProtectedRole.Manager, ProtectedRole.Staff))
+
+        RoleService().assign_roles(self.organization, [self.user], slugs)
+
+        self.assertEqual(
+            set(self.user.roles.values_list("slug", flat=True)),
+            {ProtectedRole.Manager, ProtectedRole.Staff},
+        )
+
+    def test_assign_roles_rejects_unknown_slugs(self):
+        with self.assertRaises(Role.DoesNotExist):
+            RoleService().assign_roles(
+                self.organization, [self.user], [ProtectedRole.Owner]
+            )
+
+    @override_settings(JWT_USER_CACHE={"enabled": True, "timeout": 300})
+    def test_assign_roles_invalidates_snapshots_on_commit(self):
+        cache.clear()
+        key = f"{CACHE_KEY_PREFIX}:{_get_identity('dashboard', 'user@example.com')}"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleService().assign_staff(self.organization, self.user)
+
+            self.assertIsNone(cache.get(f"{key}:generation"))
+
+        self.assertEqual(cache.get(f"{key}:generation"), 1)
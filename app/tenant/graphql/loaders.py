@@ -0,0 +1,11 @@
+from core.loaders import OneToManyLoader, register_loader
+from tenant.models import Contract, Domain, Tenant
+
+register_loader(
+    "contracts_by_tenant_loader",
+    lambda loaders: OneToManyLoader(loaders, Contract, "tenant_id", parent=Tenant),
+)
+register_loader(
+    "domains_by_tenant_loader",
+    lambda loaders: OneToManyLoader(loaders, Domain, "tenant_id", parent=Tenant),
+)
@@ -1,22 +1,77 @@
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
-from django.db.models import Q
-from django.utils.timezone import datetime
+from django.utils import timezone
+
+from django_tenants.utils import schema_context
 
+from core.helpers.cache_helper import LRUCache
 from tenant.models import Contract
 
+CACHE_KEY_PREFIX = "tenant:contract"
+
+local_cache = LRUCache(
+    maxsize=settings.CONTRACT_VALIDITY_CACHE["maxsize"],
+    timeout=settings.CONTRACT_VALIDITY_CACHE["timeout_local"],
+)
+
 
 class ContractHelper:
-    def __init__(self, schema_name: str = connection.schema_name):
-        self.schema_name = schema_name
+    def __init__(self, schema_name: str = None):
+        self.schema_name = schema_name or connection.schema_name
+
+    def get_version(self) -> int:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            return cache.get_or_set(
+                f"{CACHE_KEY_PREFIX}:{self.schema_name}:version", 0, None
+            )
+
+    def get_validity_periods(self) -> List[Tuple]:
+        # Local entries are only served while the shared version is unchanged,
+        # invalidate() on any worker revokes them everywhere
+        version = self.get_version()
+        entry = local_cache.get(self.schema_name)
+
+        if entry is not None and entry[0] == version:
+            periods = entry[1]
+        else:
+            with schema_context(settings.PUBLIC_SCHEMA_NAME):
+                key = f"{CACHE_KEY_PREFIX}:{self.schema_name}:{version}"
+
+                periods = cache.get(key)
+                if periods is None:
+                    periods = list(
+                        Contract.objects.filter(
+                            tenant__schema_name=self.schema_name
+                        ).values_list("effective_from", "expired_on")
+                    )
+                    cache.set(
+                        key, periods, settings.CONTRACT_VALIDITY_CACHE["timeout_shared"]
+                    )
+
+            local_cache.set(self.schema_name, (version, periods))
+
+        return periods
 
     def check_if_it_is_within_the_validity_period(
         self,
     ) -> bool:
-        return (
-            Contract.objects.filter(tenant__schema_name=self.schema_name)
-            .filter(
-                Q(effective_from__isnull=True) | Q(effective_from__lt=datetime.now()),
-                Q(expired_on__isnull=True) | Q(expired_on__gt=datetime.now()),
-            )
-            .exists()
+        now = timezone.now()
+
+        return any(
+            (effective_from is None or effective_from < now)
+            and (expired_on is None or expired_on > now)
+            for effective_from, expired_on in self.get_validity_periods()
         )
+
+    def invalidate(self) -> None:
+        local_cache.delete(self.schema_name)
+
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            key = f"{CACHE_KEY_PREFIX}:{self.schema_name}:version"
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
@@ -0,0 +1,54 @@
+from copy import copy
+
+from django.conf import settings
+from django.core.cache import cache
+
+from django_tenants.utils import schema_context
+
+from core.helpers.cache_helper import LRUCache
+from tenant.models import Tenant
+
+CACHE_KEY_PREFIX = "tenant:domain"
+CACHE_KEY_VERSION = CACHE_KEY_PREFIX + ":version"
+
+local_cache = LRUCache(
+    maxsize=settings.TENANT_DOMAIN_CACHE["maxsize"],
+    timeout=settings.TENANT_DOMAIN_CACHE["timeout_local"],
+)
+
+
+class DomainHelper:
+    def get_version(self) -> int:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            return cache.get_or_set(CACHE_KEY_VERSION, 0, None)
+
+    def get_tenant(self, domain: str) -> Tenant:
+        # Local entries are only served while the shared version is unchanged
+        version = self.get_version()
+        entry = local_cache.get(domain)
+
+        if entry is not None and entry[0] == version:
+            tenant = entry[1]
+        else:
+            with schema_context(settings.PUBLIC_SCHEMA_NAME):
+                key = f"{CACHE_KEY_PREFIX}:{version}:{domain}"
+
+                tenant = cache.get(key)
+                if tenant is None:
+                    tenant = Tenant.objects.get(domains__domain=domain)
+                    cache.set(
+                        key, tenant, settings.TENANT_DOMAIN_CACHE["timeout_shared"]
+                    )
+
+            local_cache.set(domain, (version, tenant))
+
+        return copy(tenant)
+
+    def invalidate(self) -> None:
+        local_cache.clear()
+
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            try:
+                cache.incr(CACHE_KEY_VERSION)
+            except ValueError:
+                cache.set(CACHE_KEY_VERSION, 1, None)
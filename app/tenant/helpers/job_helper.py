@@ -0,0 +1,312 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from django_tenants.utils import schema_context
+
+from tenant.models import Job, Task, TaskResult, Tenant
+
+STATUS_FAILED = "failed"
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+
+RETRY_DELAY = 30
+
+# Job.schema_name value that runs the handler in every tenant schema
+ALL_SCHEMAS = "*"
+
+handlers = {}
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def job_handler(
+    slug: str,
+    tenants: Callable[[QuerySet], QuerySet] = None,
+    workers: int = None,
+) -> Callable:
+    def decorator(func):
+        handlers[slug] = {"func": func, "tenants": tenants, "workers": workers}
+
+        return func
+
+    return decorator
+
+
+class FanOutExecutor:
+    def __init__(self, job: Job, task: Task, handler: dict):
+        self.job = job
+        self.task = task
+        self.func = handler["func"]
+        self.tenants = handler["tenants"]
+        self.workers = handler["workers"] or settings.SCHEDULER["fanout_workers"]
+
+    def get_schema_names(self) -> Iterable[str]:
+        queryset = Tenant.objects.exclude(schema_name=settings.PUBLIC_SCHEMA_NAME)
+        if self.tenants:
+            queryset = self.tenants(queryset)
+
+        # Schemas that succeeded on an earlier attempt are not run again
+        succeeded = TaskResult.objects.filter(
+            task=self.task, status=STATUS_SUCCESS
+        ).values("schema_name")
+
+        return (
+            queryset.exclude(schema_name__in=succeeded)
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+            .iterator(chunk_size=1000)
+        )
+
+    def run_schema(self, schema_name: str) -> dict:
+        started_at = time.monotonic()
+        error = None
+
+        try:
+            with schema_context(schema_name):
+                self.func(self.job, self.task)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            connection.close()
+
+        return {
+            "schema_name": schema_name,
+            "status": STATUS_FAILED if error else STATUS_SUCCESS,
+            "duration": round(time.monotonic() - started_at, 3),
+            "error": error,
+        }
+
+    def save_result(self, result: dict) -> None:
+        TaskResult.objects.update_or_create(
+            task=self.task,
+            schema_name=result.pop("schema_name"),
+            defaults=result,
+        )
+
+    def get_remaining(self) -> float:
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise JobTimeout(f"Timed out after {self.job.timeout}s.")
+
+        return remaining
+
+    def run(self) -> int:
+        failed = 0
+        pending = set()
+        # SIGALRM never reaches worker threads, so the deadline is enforced here
+        self.deadline = time.monotonic() + self.job.timeout
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="fanout"
+        )
+        try:
+            for schema_name in self.get_schema_names():
+                # Backpressure: keep at most two units per worker in flight
+                while len(pending) >= self.workers * 2:
+                    done, pending = wait(
+                        pending,
+                        timeout=self.get_remaining(),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    failed += self.collect(done)
+
+                pending.add(executor.submit(self.run_schema, schema_name))
+
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=self.get_remaining(),
+                    return_when=FIRST_COMPLETED,
+                )
+                failed += self.collect(done)
+        except BaseException:
+            # Queued schemas are dropped, running handlers can not be interrupted
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        executor.shutdown()
+
+        return failed
+
+    def collect(self, futures: Iterable) -> int:
+        failed = 0
+
+        for future in futures:
+            result = future.result()
+            if result["error"]:
+                failed += 1
+            self.save_result(result)
+
+        return failed
+
+
+def get_next_run_at(job: Job, after: datetime) -> datetime:
+    after = timezone.localtime(after).replace(second=0, microsecond=0)
+    job_time = datetime.strptime(job.time, "%H:%M").time() if job.time else None
+
+    for days in range(366 * 4):
+        day = after + timedelta(days=days)
+
+        if job.month and int(job.month) != day.month:
+            continue
+        if job.weekday and int(job.weekday) != day.weekday():
+            continue
+
+        if job_time:
+            run_at = day.replace(hour=job_time.hour, minute=job_time.minute)
+            if run_at > after:
+                return run_at
+        elif days == 0:
+            return after + timedelta(minutes=1)
+        else:
+            return day.replace(hour=0, minute=0)
+
+    return None
+
+
+def enqueue_due_jobs(now: datetime) -> int:
+    count = 0
+
+    with transaction.atomic():
+        jobs = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(next_run_at__lte=now) | Q(next_run_at__isnull=True),
+                Q(published_at__lte=now.date()) | Q(published_at__isnull=True),
+                is_published=True,
+            )
+            .order_by("sort_key")
+        )
+
+        for job in jobs:
+            if job.next_run_at is not None:
+                Task.objects.create(
+                    job=job,
+                    sort_key=job.sort_key,
+                    scheduled_at=job.next_run_at,
+                )
+                count += 1
+
+            Job.objects.filter(pk=job.pk).update(next_run_at=get_next_run_at(job, now))
+
+    return count
+
+
+def claim_tasks(now: datetime, limit: int) -> List[Task]:
+    with transaction.atomic():
+        # Running tasks past their lease were abandoned by a dead worker
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("job")
+            .filter(
+                Q(status=STATUS_PENDING, scheduled_at__lte=now)
+                | Q(status=STATUS_RUNNING, locked_until__lt=now)
+            )
+            .order_by("-sort_key", "scheduled_at")[:limit]
+        )
+
+        for task in tasks:
+            task.status = STATUS_RUNNING
+            task.is_locked = True
+            task.attempts += 1
+            task.started_at = now
+            task.locked_until = now + timedelta(seconds=task.job.timeout)
+
+        Task.objects.bulk_update(
+            tasks,
+            ["status", "is_locked", "attempts", "started_at", "locked_until"],
+        )
+
+    return tasks
+
+
+@contextmanager
+def time_limit(seconds: int):
+    # SIGALRM only works in the main thread, elsewhere the lease expiry applies
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def raise_timeout(signum, frame):
+        raise JobTimeout(f"Timed out after {seconds}s.")
+
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_task(task: Task) -> bool:
+    # Updates are guarded by attempts, a reclaimed task belongs to its new worker
+    job = task.job
+
+    # Tasks of a batch run one after another, so the lease starts here
+    extended = Task.objects.filter(pk=task.pk, attempts=task.attempts).update(
+        locked_until=timezone.now() + timedelta(seconds=job.timeout)
+    )
+    if not extended:
+        # The lease expired while earlier tasks of the batch ran
+        return False
+
+    try:
+        handler = handlers.get(job.slug)
+        if handler is None:
+            raise LookupError(f"No handler for {job.slug}.")
+
+        with time_limit(job.timeout):
+            if job.schema_name == ALL_SCHEMAS:
+                failed = FanOutExecutor(job, task, handler).run()
+                if failed:
+                    raise RuntimeError(f"Failed in {failed} schemas.")
+            else:
+                with schema_context(job.schema_name or settings.PUBLIC_SCHEMA_NAME):
+                    handler["func"](job, task)
+    except Exception as e:
+        error = str(e) or e.__class__.__name__
+        now = timezone.now()
+
+        if task.attempts <= job.max_retries:
+            Task.objects.filter(pk=task.pk, attempts=task.attempts).update(
+                status=STATUS_PENDING,
+                is_locked=False,
+                locked_until=None,
+                scheduled_at=now
+                + timedelta(seconds=RETRY_DELAY * 2 ** (task.attempts - 1)),
+                error=error,
+            )
+        else:
+            Task.objects.filter(pk=task.pk, attempts=task.attempts).update(
+                status=STATUS_FAILED,
+                is_locked=False,
+                locked_until=None,
+                finished_at=now,
+                error=error,
+            )
+
+        return False
+
+    Task.objects.filter(pk=task.pk, attempts=task.attempts).update(
+        status=STATUS_SUCCESS,
+        is_locked=False,
+        locked_until=None,
+        finished_at=timezone.now(),
+        error=None,
+    )
+
+    return True
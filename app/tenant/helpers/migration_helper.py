@@ -0,0 +1,74 @@
+from hashlib import sha256
+from typing import List
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from django_tenants.utils import schema_exists
+
+from tenant.models import Contract, PooledSchema, Tenant
+
+STATUS_FAILED = "failed"
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+
+
+def get_migration_run() -> str:
+    # Identify a run by the migration leaves, so reruns of a deploy resume
+    loader = MigrationLoader(connection, ignore_no_migrations=True)
+    nodes = sorted(
+        f"{app_label}.{name}" for app_label, name in loader.graph.leaf_nodes()
+    )
+
+    return sha256(",".join(nodes).encode()).hexdigest()
+
+
+def get_prioritized_schemas() -> List[str]:
+    now = timezone.now()
+    active_contracts = Contract.objects.filter(
+        Q(effective_from__isnull=True) | Q(effective_from__lt=now),
+        Q(expired_on__isnull=True) | Q(expired_on__gt=now),
+        tenant=OuterRef("pk"),
+    )
+
+    schema_names = list(
+        Tenant.objects.exclude(schema_name=settings.PUBLIC_SCHEMA_NAME)
+        .annotate(is_active=Exists(active_contracts))
+        .order_by("-is_active", "created_at")
+        .values_list("schema_name", flat=True)
+    )
+    schema_names += PooledSchema.objects.values_list("schema_name", flat=True)
+
+    template_schema = settings.TENANT_PROVISIONING["template_schema"]
+    if schema_exists(template_schema):
+        schema_names.append(template_schema)
+
+    return schema_names
+
+
+def migrate_schema(schema_name: str) -> dict:
+    started_at = time.monotonic()
+    report = {"schema_name": schema_name, "error": None}
+
+    try:
+        call_command(
+            "migrate_schemas",
+            tenant=True,
+            schema_name=schema_name,
+            interactive=False,
+            verbosity=0,
+        )
+    except Exception as e:
+        report["error"] = str(e) or e.__class__.__name__
+    finally:
+        connections.close_all()
+
+    report["status"] = STATUS_FAILED if report["error"] else STATUS_SUCCESS
+    report["duration"] = round(time.monotonic() - started_at, 3)
+
+    return report
@@ -0,0 +1,87 @@
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from django_tenants.utils import schema_context
+
+from tenant.models import Domain
+
+CACHE_KEY_VERSION = "tenant:origin:version"
+
+
+class OriginRegistry:
+    def __init__(self, refresh_interval: float = 5):
+        self.refresh_interval = refresh_interval
+        self._origins = set()
+        self._version = None
+        self._checked_at = 0
+        self._lock = Lock()
+
+    def __contains__(self, origin: str) -> bool:
+        self.refresh()
+        return origin in self._origins
+
+    def get_static_origins(self) -> set:
+        origins = set()
+        for origin in (
+            list(settings.CORS_ALLOWED_ORIGINS)
+            + list(settings.CORS_ORIGIN_WHITELIST)
+            + list(settings.CSRF_TRUSTED_ORIGINS)
+        ):
+            origins.add(origin)
+            origins.add(origin.replace("http://", "https://"))
+
+        return origins
+
+    def build(self, version: int) -> None:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            domains = Domain.objects.values_list("domain", flat=True)
+            origins = self.get_static_origins()
+            origins.update("https://" + domain for domain in domains)
+
+        self._origins = origins
+        self._version = version
+
+    def get_version(self) -> int:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            return cache.get_or_set(CACHE_KEY_VERSION, 0, None)
+
+    def refresh(self) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            version = self.get_version()
+            if version != self._version:
+                self.build(version)
+            self._checked_at = now
+
+    def bump_version(self) -> None:
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            try:
+                version = cache.incr(CACHE_KEY_VERSION)
+            except ValueError:
+                version = 1
+                cache.set(CACHE_KEY_VERSION, version, None)
+
+        with self._lock:
+            if self._version == version - 1:
+                self._version = version
+            else:
+                self._version = None
+
+    def add(self, domain: str) -> None:
+        with self._lock:
+            self._origins.add("https://" + domain)
+        self.bump_version()
+
+    def discard(self, domain: str) -> None:
+        with self._lock:
+            self._origins.discard("https://" + domain)
+        self.bump_version()
+
+
+origin_registry = OriginRegistry()
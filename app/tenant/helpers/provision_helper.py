@@ -0,0 +1,167 @@
+from typing import Iterator, Optional
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from django_tenants.utils import schema_context
+from safedelete.models import HARD_DELETE
+
+from account.models import User
+from organization.services.organization_service import OrganizationService
+from tenant.models import Domain, Tenant
+from tenant.services.tenant_service import TenantService
+
+FIELDS = ("subdomain", "organization_name", "email", "password")
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+
+        for row in rows:
+            yield {field: (row.get(field) or "").strip() for field in FIELDS}
+
+
+def recover_tenant(row: dict, created: dict) -> Optional[Tenant]:
+    # Only the tenant journaled by this run is touched, the subdomain alone
+    # may match an unrelated tenant
+    tenant = Tenant.objects.filter(
+        pk=created["tenant_id"], schema_name=created["schema_name"]
+    ).first()
+    if tenant is None:
+        return None
+
+    with schema_context(tenant.schema_name):
+        completed = User.objects.filter(
+            endpoint="dashboard", email=row["email"]
+        ).exists()
+
+    if completed:
+        return tenant
+
+    # Created by this run and interrupted before the schema was initiated
+    tenant.delete(force_policy=HARD_DELETE)
+
+    return None
+
+
+def provision_tenant(
+    row: dict,
+    strategy: str = None,
+    journal_path: str = None,
+    resume: bool = False,
+    created: dict = None,
+) -> dict:
+    started_at = time.monotonic()
+    report = {"subdomain": row["subdomain"], "tenant_id": None, "error": None}
+
+    try:
+        if not all(row[field] for field in FIELDS):
+            raise ValueError("Missing field.")
+
+        if resume:
+            if created and (tenant := recover_tenant(row, created)):
+                report["tenant_id"] = str(tenant.id)
+                return report
+
+            domain = row["subdomain"] + "." + settings.DOMAIN_WEBSITE
+            if not created and Domain.objects.filter(domain=domain).exists():
+                # Not journaled as ours, it may belong to another tenant
+                report["conflict"] = True
+                raise ValueError("The subdomain is already taken!")
+
+        tenant_service = TenantService()
+        result, tenant = tenant_service.create_tenant(
+            subdomain=row["subdomain"],
+            email=row["email"],
+            strategy=strategy,
+        )
+        if not result:
+            raise ValueError("Can not create a tenant!")
+        if journal_path:
+            ProvisionJournal(journal_path).created(row, tenant)
+
+        try:
+            organization_service = OrganizationService()
+            result, _, _ = organization_service.initiate_schema(
+                schema_name=tenant.schema_name,
+                organization_name=row["organization_name"],
+                email=row["email"],
+                password=row["password"],
+            )
+            if not result:
+                raise ValueError("Can not initiate the schema!")
+        except Exception:
+            # Drop the half-provisioned tenant so the row can be retried
+            tenant.delete(force_policy=HARD_DELETE)
+            raise
+
+        report["tenant_id"] = str(tenant.id)
+    except Exception as e:
+        report["error"] = str(e) or e.__class__.__name__
+    finally:
+        connections.close_all()
+        report["success"] = report["error"] is None
+        report["duration"] = round(time.monotonic() - started_at, 3)
+
+    return report
+
+
+class ProvisionJournal:
+    def __init__(self, path: str):
+        self.path = path
+
+    def read(self) -> Iterator[dict]:
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, encoding="utf-8") as file:
+            yield from map(json.loads, filter(str.strip, file))
+
+    def get_completed(self) -> set:
+        return {report["subdomain"] for report in self.read() if report.get("success")}
+
+    def get_started(self) -> dict:
+        # Started rows without a result were interrupted, they map to the
+        # tenant the run created for them or None
+        started = {}
+        for report in self.read():
+            subdomain = report["subdomain"]
+            if report.get("started"):
+                started[subdomain] = None
+            elif report.get("created"):
+                if subdomain in started:
+                    started[subdomain] = {
+                        "tenant_id": report["tenant_id"],
+                        "schema_name": report["schema_name"],
+                    }
+            else:
+                started.pop(subdomain, None)
+
+        return started
+
+    def write(self, report: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(report) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def start(self, row: dict) -> None:
+        self.write({"subdomain": row["subdomain"], "started": True})
+
+    def created(self, row: dict, tenant: Tenant) -> None:
+        self.write(
+            {
+                "subdomain": row["subdomain"],
+                "created": True,
+                "tenant_id": str(tenant.id),
+                "schema_name": tenant.schema_name,
+            }
+        )
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+
+from django_tenants.clone import CloneSchema
+from django_tenants.utils import schema_context, schema_exists
+
+from log.helpers.partition_helper import repair_partitions
+
+STRATEGY_CLONE = "clone"
+STRATEGY_MIGRATE = "migrate"
+
+
+class SchemaHelper:
+    def __init__(self, strategy: str = None):
+        self.strategy = strategy or settings.TENANT_PROVISIONING["strategy"]
+        self.template_schema = settings.TENANT_PROVISIONING["template_schema"]
+
+    def sync_template(self, verbosity: int = 1) -> None:
+        if not schema_exists(self.template_schema):
+            with connection.cursor() as cursor:
+                cursor.execute('CREATE SCHEMA "%s"' % self.template_schema)
+
+        call_command(
+            "migrate_schemas",
+            tenant=True,
+            schema_name=self.template_schema,
+            interactive=False,
+            verbosity=verbosity,
+        )
+
+        # Install clone_schema() up front, it commits when installed lazily
+        CloneSchema()._create_clone_schema_function()
+
+    def create_schema(self, schema_name: str, verbosity: int = 0) -> None:
+        # The caller's active schema is restored on exit
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            if self.strategy == STRATEGY_CLONE:
+                if not schema_exists(self.template_schema):
+                    raise ImproperlyConfigured(
+                        f"The {self.template_schema} schema does not exist,"
+                        " run schema_manager --sync first."
+                    )
+
+                # The template carries its django_migrations rows along
+                CloneSchema().clone_schema(self.template_schema, schema_name)
+
+                with schema_context(schema_name):
+                    repair_partitions()
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute('CREATE SCHEMA "%s"' % schema_name)
+
+                call_command(
+                    "migrate_schemas",
+                    tenant=True,
+                    schema_name=schema_name,
+                    interactive=False,
+                    verbosity=verbosity,
+                )
+
+    def ensure_schema(self, schema_name: str) -> bool:
+        if schema_exists(schema_name):
+            return False
+
+        self.create_schema(schema_name)
+
+        return True
+
+    def drop_schema(self, schema_name: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('DROP SCHEMA IF EXISTS "%s" CASCADE' % schema_name)
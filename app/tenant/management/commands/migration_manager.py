@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+import statistics
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tenant.helpers.migration_helper import (
+    STATUS_RUNNING,
+    STATUS_SUCCESS,
+    get_migration_run,
+    get_prioritized_schemas,
+    migrate_schema,
+)
+from tenant.models import SchemaMigration
+
+
+class Command(BaseCommand):
+    help = "Migration Manager"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Specify the number of worker processes.",
+        )
+        parser.add_argument(
+            "--run",
+            help="Specify a run id. Defaults to a hash of the latest migrations.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Migrate every schema again instead of resuming the run.",
+        )
+        parser.add_argument(
+            "--stragglers",
+            type=int,
+            default=10,
+            help="Specify the number of slowest schemas to report.",
+        )
+
+    def handle(self, *args, **options):
+        call_command("migrate_schemas", shared=True, interactive=False, verbosity=0)
+
+        run = options.get("run") or get_migration_run()
+        if options.get("restart"):
+            SchemaMigration.objects.filter(run=run).delete()
+
+        completed = set(
+            SchemaMigration.objects.filter(run=run, status=STATUS_SUCCESS).values_list(
+                "schema_name", flat=True
+            )
+        )
+        schema_names = [
+            schema_name
+            for schema_name in get_prioritized_schemas()
+            if schema_name not in completed
+        ]
+
+        total = len(schema_names)
+        self.stdout.write(
+            f"Run {run[:12]}: migrating {total} schemas, skipping {len(completed)}."
+        )
+
+        for schema_name in schema_names:
+            SchemaMigration.objects.update_or_create(
+                run=run,
+                schema_name=schema_name,
+                defaults={"status": STATUS_RUNNING, "duration": None, "error": None},
+            )
+
+        reports = []
+        started_at = time.monotonic()
+
+        # Forked workers must not share the parent's connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=options.get("processes"),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [
+                executor.submit(migrate_schema, schema_name)
+                for schema_name in schema_names
+            ]
+
+            for index, future in enumerate(as_completed(futures), 1):
+                report = future.result()
+                reports.append(report)
+
+                SchemaMigration.objects.filter(
+                    run=run, schema_name=report["schema_name"]
+                ).update(
+                    status=report["status"],
+                    duration=report["duration"],
+                    error=report["error"],
+                )
+
+                if report["error"]:
+                    message = self.style.ERROR(
+                        f"[{index}/{total}] {report['schema_name']}"
+                        f" {report['error']} {report['duration']}s"
+                    )
+                else:
+                    message = (
+                        f"[{index}/{total}] {report['schema_name']}"
+                        f" {report['duration']}s"
+                    )
+                self.stdout.write(message)
+
+        elapsed = time.monotonic() - started_at
+        failed = [report for report in reports if report["error"]]
+        throughput = len(reports) / elapsed * 60 if elapsed else 0
+
+        self.stdout.write(
+            f"Succeeded: {len(reports) - len(failed)}, Failed: {len(failed)}, "
+            f"Skipped: {len(completed)}, Elapsed: {elapsed:.1f}s, "
+            f"Throughput: {throughput:.1f} schemas/min"
+        )
+
+        if reports:
+            durations = [report["duration"] for report in reports]
+            self.stdout.write(
+                f"Duration: median={statistics.median(durations):.3f}s"
+                f" max={max(durations):.3f}s"
+            )
+
+            stragglers = sorted(reports, key=lambda report: -report["duration"])
+            for report in stragglers[: options.get("stragglers")]:
+                self.stdout.write(
+                    f"Straggler: {report['schema_name']} {report['duration']}s"
+                )
+
+        if failed:
+            self.stdout.write(
+                self.style.ERROR("Failed schemas are retried when the run is resumed.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Successfully migrate all schemas!"))
@@ -1,61 +1,76 @@
+import signal
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import close_old_connections
 from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
 
-from tenant.models import Job, Task
+from tenant.helpers.job_helper import claim_tasks, enqueue_due_jobs, run_task
 
 
 class Command(BaseCommand):
     help = "Schedule Manager"
 
-    def handle(self, *args, **options):
-        current_datetime = timezone.localtime(timezone.now())
-
-        # Create tasks from jobs
-        jobs_without_tasks = Job.objects.filter(tasks__isnull=True).order_by("sort_key")
-
-        for job in jobs_without_tasks:
-            if not job.is_visible:
-                continue
-
-            if job.month:
-                if int(job.month) != current_datetime.month:
-                    continue
-
-            if job.weekday:
-                if int(job.day_of_week) != current_datetime.weekday():
-                    continue
-
-            if job.time:
-                job_time = timezone.datetime.strptime(job.time, "%H:%M").time()
-                if (
-                    current_datetime.hour != job_time.hour
-                    or current_datetime.minute != job_time.minute
-                ):
-                    continue
-
-            Task.objects.create(job=job, sort_key=job.sort_key, is_locked=False)
-
-        # Execute tasks
-        tasks = (
-            Task.objects.select_related("job")
-            .filter(is_locked=False)
-            .order_by("-sort_key")
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-w",
+            "--worker",
+            action="store_true",
+            help="Keep polling for tasks instead of running once.",
+        )
+
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=10,
+            help="Specify the number of tasks claimed at a time.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Specify the seconds between polls in worker mode.",
         )
-        for task in tasks:
-            try:
-                if not task.job.is_visible:
-                    continue
 
-                task.is_locked = True
-                task.save()
+    def handle(self, *args, **options):
+        # Handlers are registered with @job_handler in <app>/jobs.py
+        autodiscover_modules("jobs")
+        self.running = True
+
+        if options.get("w") or options.get("worker"):
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+            while self.running:
+                close_old_connections()
+
+                if not self.run_once(options.get("batch_size")):
+                    time.sleep(options.get("interval"))
+        else:
+            self.run_once(options.get("batch_size"))
+
+            self.stdout.write(self.style.SUCCESS("Job completed successfully!"))
+
+    def run_once(self, batch_size: int) -> int:
+        enqueue_due_jobs(timezone.now())
+
+        count = 0
+        while self.running:
+            tasks = claim_tasks(timezone.now(), batch_size)
+            if not tasks:
+                break
 
-                if task.slug == "xxx":
-                    pass
+            for task in tasks:
+                if run_task(task):
+                    self.stdout.write(f"{task.job.slug} {task.id} succeeded")
+                else:
+                    self.stdout.write(
+                        self.style.ERROR(f"{task.job.slug} {task.id} failed")
+                    )
+                count += 1
 
-                task.delete()
-            except Job.DoesNotExist:
-                pass
-            except Task.DoesNotExist:
-                pass
+        return count
 
-        self.stdout.write(self.style.SUCCESS("Job completed successfully!"))
+    def stop(self, signum, frame):
+        self.running = False
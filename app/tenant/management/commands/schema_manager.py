@@ -0,0 +1,132 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from tenant.helpers.schema_helper import STRATEGY_CLONE, STRATEGY_MIGRATE, SchemaHelper
+from tenant.models import PooledSchema
+from tenant.services.tenant_service import TenantService
+
+
+class Command(BaseCommand):
+    help = "Schema Manager"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-s",
+            "--sync",
+            action="store_true",
+            help="Create or migrate the template schema.",
+        )
+        parser.add_argument(
+            "-f",
+            "--fill",
+            action="store_true",
+            help="Top up the pool of pre-provisioned schemas.",
+        )
+        parser.add_argument(
+            "-m",
+            "--migrate_pool",
+            action="store_true",
+            help="Migrate the pooled schemas.",
+        )
+        parser.add_argument(
+            "-b",
+            "--benchmark",
+            action="store_true",
+            help="Compare the provisioning strategies.",
+        )
+
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=settings.TENANT_POOL["size"],
+            help="Specify the pool size.",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Specify the number of schemas per strategy.",
+        )
+
+    def handle(self, *args, **options):
+        if options.get("s") or options.get("sync"):
+            schema_helper = SchemaHelper()
+            schema_helper.sync_template(verbosity=options.get("verbosity"))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully sync the {schema_helper.template_schema} schema!"
+                )
+            )
+
+        elif options.get("f") or options.get("fill"):
+            tenant_service = TenantService()
+            count = tenant_service.fill_pool(size=options.get("size"))
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully add {count} pooled schemas!")
+            )
+
+        elif options.get("m") or options.get("migrate_pool"):
+            schema_names = PooledSchema.objects.values_list("schema_name", flat=True)
+
+            for schema_name in schema_names:
+                call_command(
+                    "migrate_schemas",
+                    tenant=True,
+                    schema_name=schema_name,
+                    interactive=False,
+                    verbosity=options.get("verbosity"),
+                )
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully migrate {len(schema_names)} pooled schemas!"
+                )
+            )
+
+        elif options.get("b") or options.get("benchmark"):
+            rounds = options.get("rounds")
+
+            SchemaHelper().sync_template(verbosity=0)
+
+            for strategy in (STRATEGY_MIGRATE, STRATEGY_CLONE):
+                schema_helper = SchemaHelper(strategy=strategy)
+                durations = []
+                failures = 0
+
+                for _ in range(rounds):
+                    schema_name = "benchmark_" + uuid.uuid4().hex[:16]
+
+                    started_at = time.monotonic()
+                    try:
+                        schema_helper.create_schema(schema_name)
+                        durations.append(time.monotonic() - started_at)
+                    except Exception as e:
+                        failures += 1
+                        self.stdout.write(self.style.ERROR(f"{strategy}: {e}"))
+                    finally:
+                        schema_helper.drop_schema(schema_name)
+
+                if not durations:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"{strategy}: rounds={rounds} failed={failures}"
+                        )
+                    )
+                    continue
+
+                durations.sort()
+                self.stdout.write(
+                    f"{strategy}: rounds={rounds} failed={failures}"
+                    f" mean={sum(durations) / len(durations):.3f}s"
+                    f" median={durations[len(durations) // 2]:.3f}s"
+                    f" max={durations[-1]:.3f}s"
+                )
+
+        else:
+            self.stdout.write(self.style.ERROR("Please provide the correct option."))
@@ -1,6 +1,16 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from organization.services.organization_service import OrganizationService
+from tenant.helpers.provision_helper import (
+    ProvisionJournal,
+    provision_tenant,
+    read_rows,
+)
 from tenant.services.tenant_service import TenantService
 
 
@@ -14,6 +24,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Create a tenant",
         )
+        parser.add_argument(
+            "-b",
+            "--bulk",
+            action="store_true",
+            help="Create tenants from a CSV or JSONL file.",
+        )
         parser.add_argument(
             "-d",
             "--delete",
@@ -47,6 +63,25 @@ class Command(BaseCommand):
             "--password",
             help="Specify a password.",
         )
+        parser.add_argument(
+            "--file",
+            help="Specify a CSV or JSONL file with subdomain, organization_name, email and password.",
+        )
+        parser.add_argument(
+            "--journal",
+            help="Specify a journal file for resuming. Defaults to <file>.journal.",
+        )
+        parser.add_argument(
+            "--strategy",
+            choices=("clone", "migrate"),
+            help="Specify a provisioning strategy. Defaults to TENANT_PROVISIONING.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Specify the number of worker processes.",
+        )
 
     def handle(self, *args, **options):
         if options.get("c") or options.get("create"):
@@ -65,6 +100,7 @@ class Command(BaseCommand):
                 result, tenant = tenant_service.create_tenant(
                     subdomain=subdomain,
                     email=email,
+                    strategy=options.get("strategy"),
                 )
 
                 if result:
@@ -87,6 +123,20 @@ class Command(BaseCommand):
                     self.style.ERROR("Please provide the correct option.")
                 )
 
+        elif options.get("b") or options.get("bulk"):
+            if options.get("file"):
+                self.handle_bulk(
+                    path=options.get("file"),
+                    journal_path=options.get("journal")
+                    or options.get("file") + ".journal",
+                    workers=options.get("workers"),
+                    strategy=options.get("strategy"),
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR("Please provide the correct option.")
+                )
+
         elif options.get("d") or options.get("delete"):
             if options.get("tenant_id"):
                 tenant_id = options.get("tenant_id")
@@ -129,3 +179,79 @@ class Command(BaseCommand):
 
         else:
             self.stdout.write(self.style.ERROR("Please provide the correct option."))
+
+    def handle_bulk(
+        self, path: str, journal_path: str, workers: int, strategy: str = None
+    ):
+        journal = ProvisionJournal(journal_path)
+        completed = journal.get_completed()
+        started = journal.get_started()
+
+        rows = []
+        skipped = 0
+        for row in read_rows(path):
+            if row["subdomain"] in completed:
+                skipped += 1
+            else:
+                rows.append(row)
+
+        total = len(rows)
+        succeeded = 0
+        failed = 0
+        started_at = time.monotonic()
+
+        self.stdout.write(f"Provisioning {total} tenants, skipping {skipped}.")
+
+        # Forked workers must not share the parent's connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = []
+            for row in rows:
+                # Journaled before the tenant exists, so a crash can be recovered
+                journal.start(row)
+                futures.append(
+                    executor.submit(
+                        provision_tenant,
+                        row,
+                        strategy,
+                        journal_path,
+                        row["subdomain"] in started,
+                        started.get(row["subdomain"]),
+                    )
+                )
+
+            for index, future in enumerate(as_completed(futures), 1):
+                report = future.result()
+                journal.write(report)
+
+                if report["success"]:
+                    succeeded += 1
+                    message = self.style.SUCCESS(
+                        f"[{index}/{total}] {report['subdomain']}"
+                        f" {report['tenant_id']} {report['duration']}s"
+                    )
+                else:
+                    failed += 1
+                    message = self.style.ERROR(
+                        f"[{index}/{total}] {report['subdomain']}"
+                        f" {report['error']} {report['duration']}s"
+                    )
+                self.stdout.write(message)
+
+        elapsed = time.monotonic() - started_at
+        throughput = succeeded / elapsed * 60 if elapsed else 0
+
+        self.stdout.write(
+            f"Succeeded: {succeeded}, Failed: {failed}, Skipped: {skipped}, "
+            f"Elapsed: {elapsed:.1f}s, Throughput: {throughput:.1f} tenants/min"
+        )
+        if failed:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Failed tenants are retried on rerun ({journal_path})."
+                )
+            )
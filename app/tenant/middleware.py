@@ -7,6 +7,7 @@ from django.http.request import HttpRequest
 from django_tenants.utils import get_tenant_model
 from django_tenants.middleware import TenantMainMiddleware
 
+from tenant.helpers.domain_helper import DomainHelper
 from tenant.models import Tenant
 
 
@@ -29,12 +30,12 @@ class XTenantMiddleware(TenantMainMiddleware):
     def get_tenant(
         self, tenant_model: Type[Tenant], request: HttpRequest
     ) -> Type[Tenant]:
+        domain_helper = DomainHelper()
+
         if domain := request.headers.get("X-Tenant"):
-            return tenant_model.objects.get(domains__domain=domain)
+            return domain_helper.get_tenant(domain)
         else:
             if settings.PLAYGROUND:
                 return tenant_model.objects.first()
             else:
-                return tenant_model.objects.get(
-                    domains__domain=self.hostname_from_request(request)
-                )
+                return domain_helper.get_tenant(self.hostname_from_request(request))
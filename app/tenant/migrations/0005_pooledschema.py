@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:00
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant", "0004_job_task"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PooledSchema",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("schema_name", models.CharField(max_length=32, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "db_table": "app_tenant_pooled_schema",
+                "ordering": ["created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:00
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant", "0005_pooledschema"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchemaMigration",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("run", models.CharField(db_index=True, max_length=64)),
+                ("schema_name", models.CharField(max_length=63)),
+                ("status", models.CharField(db_index=True, max_length=10)),
+                ("duration", models.FloatField(null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "app_tenant_schema_migration",
+                "ordering": ["created_at"],
+                "unique_together": {("run", "schema_name")},
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant", "0006_schemamigration"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="next_run_at",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="timeout",
+            field=models.PositiveIntegerField(default=300),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="max_retries",
+            field=models.PositiveIntegerField(default=3),
+        ),
+        migrations.RenameField(
+            model_name="task",
+            old_name="task",
+            new_name="job",
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="status",
+            field=models.CharField(default="pending", max_length=10),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="scheduled_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="locked_until",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="error",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="started_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="finished_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "scheduled_at"], name="app_task_status_18ba72_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "locked_until"], name="app_task_status_2f47ee_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.8 on 2026-10-18 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant", "0007_job_engine"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskResult",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("schema_name", models.CharField(max_length=63)),
+                ("status", models.CharField(max_length=10)),
+                ("duration", models.FloatField(null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="tenant.task",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "app_task_result",
+                "ordering": ["created_at"],
+                "unique_together": {("task", "schema_name")},
+            },
+        ),
+    ]
@@ -68,6 +68,38 @@ class Domain(DomainMixin, CommonDateAndSafeDeleteMixin):
         return str(self.id)
 
 
+class PooledSchema(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    schema_name = models.CharField(max_length=32, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_tenant_pooled_schema"
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return self.schema_name
+
+
+class SchemaMigration(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    run = models.CharField(max_length=64, db_index=True)
+    schema_name = models.CharField(max_length=63)
+    status = models.CharField(max_length=10, db_index=True)
+    duration = models.FloatField(null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_tenant_schema_migration"
+        ordering = ["created_at"]
+        unique_together = (("run", "schema_name"),)
+
+    def __str__(self):
+        return self.schema_name
+
+
 class Job(CommonDateAndSafeDeleteMixin, PublishableModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     slug = models.CharField(max_length=255, db_index=True, blank=True, null=True)
@@ -78,6 +110,9 @@ class Job(CommonDateAndSafeDeleteMixin, PublishableModel):
     weekday = models.CharField(max_length=1, blank=True, null=True)
     time = models.CharField(max_length=5, blank=True, null=True)
     sort_key = models.IntegerField(db_index=True, null=True)
+    next_run_at = models.DateTimeField(db_index=True, null=True)
+    timeout = models.PositiveIntegerField(default=300)
+    max_retries = models.PositiveIntegerField(default=3)
 
     class Meta:
         db_table = settings.APP_NAME + "_job"
@@ -90,7 +125,7 @@ class Job(CommonDateAndSafeDeleteMixin, PublishableModel):
 
 class Task(CommonDateAndSafeDeleteMixin, PublishableModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    task = models.ForeignKey(
+    job = models.ForeignKey(
         Job,
         db_index=True,
         related_name="tasks",
@@ -98,11 +133,45 @@ class Task(CommonDateAndSafeDeleteMixin, PublishableModel):
     )
     sort_key = models.IntegerField(db_index=True, null=True)
     is_locked = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, default="pending")
+    scheduled_at = models.DateTimeField(null=True)
+    locked_until = models.DateTimeField(null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
 
     class Meta:
         db_table = settings.APP_NAME + "_task"
         get_latest_by = "updated_at"
+        indexes = [
+            models.Index(fields=["status", "scheduled_at"]),
+            models.Index(fields=["status", "locked_until"]),
+        ]
         ordering = ["sort_key"]
 
     def __str__(self):
         return str(self.id)
+
+
+class TaskResult(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey(
+        Task,
+        related_name="results",
+        on_delete=models.CASCADE,
+    )
+    schema_name = models.CharField(max_length=63)
+    status = models.CharField(max_length=10)
+    duration = models.FloatField(null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_task_result"
+        ordering = ["created_at"]
+        unique_together = (("task", "schema_name"),)
+
+    def __str__(self):
+        return self.schema_name
@@ -0,0 +1,75 @@
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from corsheaders.signals import check_request_enabled
+
+from tenant.helpers.contract_helper import ContractHelper
+from tenant.helpers.domain_helper import DomainHelper
+from tenant.helpers.origin_helper import origin_registry
+from tenant.models import Contract, Domain, Tenant
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_domain_cache(sender, instance, **kwargs):
+    transaction.on_commit(DomainHelper().invalidate)
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def invalidate_contract_cache(sender, instance: Contract, **kwargs):
+    if Contract.tenant.is_cached(instance):
+        schema_name = instance.tenant.schema_name
+    else:
+        schema_name = (
+            Tenant.all_objects.filter(pk=instance.tenant_id)
+            .values_list("schema_name", flat=True)
+            .first()
+        )
+
+    if schema_name:
+        transaction.on_commit(ContractHelper(schema_name=schema_name).invalidate)
+
+
+@receiver(post_init, sender=Domain)
+def remember_domain_origin(sender, instance: Domain, **kwargs):
+    instance._original_domain = instance.__dict__.get("domain")
+
+
+@receiver(post_save, sender=Domain)
+def update_domain_origin(sender, instance: Domain, created: bool, **kwargs):
+    original = instance._original_domain
+    value = instance.domain
+
+    def on_commit():
+        if original and original != value:
+            origin_registry.discard(original)
+        if instance.deleted:
+            origin_registry.discard(value)
+        else:
+            origin_registry.add(value)
+
+    instance._original_domain = value
+    transaction.on_commit(on_commit)
+
+
+@receiver(post_delete, sender=Domain)
+def remove_domain_origin(sender, instance: Domain, **kwargs):
+    transaction.on_commit(lambda: origin_registry.discard(instance.domain))
+
+
+@receiver(check_request_enabled)
+def cors_allow_domain_origin(sender, request, **kwargs):
+    origin = request.headers.get("Origin")
+
+    return (
+        origin is not None
+        and re.match(settings.CORS_URLS_REGEX, request.path_info) is not None
+        and origin in origin_registry
+    )
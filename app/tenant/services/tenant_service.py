@@ -1,44 +1,65 @@
-from typing import Tuple
+from typing import Optional, Tuple
 import uuid
 
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Exists, OuterRef
 from django.db.utils import IntegrityError
 
+from django_tenants.models import TenantMixin
+from django_tenants.signals import post_schema_sync
 from safedelete.models import HARD_DELETE
 
-from tenant.models import Contract, Domain, Tenant
+from organization.services.organization_service import OrganizationService
+from tenant.helpers.schema_helper import STRATEGY_CLONE, SchemaHelper
+from tenant.models import Contract, Domain, PooledSchema, Tenant
 from tenant.services.domain_service import DomainService
 
 
 class TenantService:
     @transaction.atomic
-    def create_tenant(self, subdomain: str, email: str) -> Tuple[bool, Tenant]:
-        schema_name = str(uuid.uuid4()).replace("-", "")
+    def create_tenant(
+        self, subdomain: str, email: str, strategy: str = None
+    ) -> Tuple[bool, Tenant]:
+        pooled_schema = self.claim_pooled_schema()
+        if pooled_schema:
+            schema_name = pooled_schema.schema_name
+        else:
+            schema_name = str(uuid.uuid4()).replace("-", "")
+        schema_helper = SchemaHelper(strategy=strategy)
 
         tenant = Tenant(
             schema_name=schema_name,
             email=email,
         )
-        tenant.save()
+        if pooled_schema:
+            tenant.auto_create_schema = False
+            tenant.save()
+        elif schema_helper.strategy == STRATEGY_CLONE:
+            tenant.auto_create_schema = False
+            tenant.save()
+            schema_helper.create_schema(schema_name)
+            post_schema_sync.send(sender=TenantMixin, tenant=tenant)
+        else:
+            tenant.save()
 
         try:
-            # Add contract for the tenant
-            contract = Contract(
-                tenant=tenant,
-                slug=schema_name,
-            )
-            contract.save()
-
-            # Add a domain for the tenant
-            domain_service = DomainService()
-            domain_service.create_domain(
-                tenant=tenant,
-                value=subdomain + "." + settings.DOMAIN_WEBSITE,
-                is_primary=True,
-                is_builtin=True,
-            )
+            with transaction.atomic():
+                # Add contract for the tenant
+                contract = Contract(
+                    tenant=tenant,
+                    slug=schema_name,
+                )
+                contract.save()
+
+                # Add a domain for the tenant
+                domain_service = DomainService()
+                domain_service.create_domain(
+                    tenant=tenant,
+                    value=subdomain + "." + settings.DOMAIN_WEBSITE,
+                    is_primary=True,
+                    is_builtin=True,
+                )
 
         except IntegrityError:
             result = False
@@ -46,11 +67,63 @@ class TenantService:
             result = True
 
         if not result:
+            if pooled_schema:
+                # The claimed schema is untouched, hand it back to the pool
+                tenant.auto_drop_schema = False
             tenant.delete(force_policy=HARD_DELETE)
+            if pooled_schema:
+                PooledSchema.objects.create(schema_name=schema_name)
             tenant = None
 
         return result, tenant
 
+    def claim_pooled_schema(self) -> Optional[PooledSchema]:
+        if not settings.TENANT_POOL["enabled"]:
+            return None
+
+        pooled_schema = (
+            PooledSchema.objects.select_for_update(skip_locked=True)
+            .order_by("created_at")
+            .first()
+        )
+        if pooled_schema:
+            pooled_schema.delete()
+
+        return pooled_schema
+
+    def lock_pool(self) -> None:
+        # Held until the surrounding transaction ends
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))",
+                [PooledSchema._meta.db_table],
+            )
+
+    def fill_pool(self, size: int) -> int:
+        count = 0
+
+        while True:
+            schema_name = str(uuid.uuid4()).replace("-", "")
+
+            with transaction.atomic():
+                # Concurrent runs take turns, so the pool is never overfilled
+                self.lock_pool()
+                if PooledSchema.objects.count() >= size:
+                    break
+
+                schema_helper = SchemaHelper()
+                schema_helper.create_schema(schema_name)
+
+                organization_service = OrganizationService()
+                if not organization_service.prepare_schema(schema_name):
+                    schema_helper.drop_schema(schema_name)
+                    break
+
+                PooledSchema.objects.create(schema_name=schema_name)
+                count += 1
+
+        return count
+
     @transaction.atomic
     def updateEmail(self, scope: str, email_original: str, email_new) -> bool:
         domain_hq = "hq." + settings.DOMAIN_HQ
@@ -0,0 +1,356 @@
+from datetime import timedelta
+from unittest import mock
+import os
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context, schema_exists
+
+from account.models import User
+from tenant.helpers.contract_helper import ContractHelper
+from tenant.helpers.contract_helper import local_cache as contract_local_cache
+from tenant.helpers.domain_helper import CACHE_KEY_VERSION, DomainHelper, local_cache
+from tenant.helpers.job_helper import (
+    STATUS_RUNNING,
+    FanOutExecutor,
+    JobTimeout,
+    claim_tasks,
+    handlers,
+    run_task,
+)
+from tenant.helpers.provision_helper import (
+    ProvisionJournal,
+    provision_tenant,
+    recover_tenant,
+)
+from tenant.helpers.schema_helper import STRATEGY_CLONE, STRATEGY_MIGRATE, SchemaHelper
+from tenant.models import Contract, Job, PooledSchema, Task, Tenant
+from tenant.services.tenant_service import TenantService
+
+
+class DomainHelperTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        local_cache.clear()
+
+    def test_get_tenant_is_served_from_the_local_cache(self):
+        domain_helper = DomainHelper()
+        domain_helper.get_tenant(self.domain.domain)
+
+        with self.assertNumQueries(0):
+            tenant = domain_helper.get_tenant(self.domain.domain)
+
+        self.assertEqual(tenant.pk, self.tenant.pk)
+
+    def test_local_entry_is_dropped_after_a_shared_invalidation(self):
+        domain_helper = DomainHelper()
+        domain_helper.get_tenant(self.domain.domain)
+
+        # Another worker changes the tenant and only bumps the shared version
+        Tenant.objects.filter(pk=self.tenant.pk).update(email="moved@example.com")
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            cache.incr(CACHE_KEY_VERSION)
+
+        tenant = domain_helper.get_tenant(self.domain.domain)
+
+        self.assertEqual(tenant.email, "moved@example.com")
+
+
+class ContractHelperTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        contract_local_cache.clear()
+        cache.clear()
+        self.contract = Contract.objects.create(
+            tenant=self.tenant, slug=self.tenant.schema_name
+        )
+
+    def test_local_entry_is_dropped_after_a_shared_invalidation(self):
+        contract_helper = ContractHelper(schema_name=self.tenant.schema_name)
+        self.assertTrue(contract_helper.check_if_it_is_within_the_validity_period())
+
+        # Another worker revokes the contract, only the shared version changes
+        Contract.objects.filter(pk=self.contract.pk).update(
+            expired_on=timezone.now() - timedelta(days=1)
+        )
+        with mock.patch.object(contract_local_cache, "delete"):
+            ContractHelper(schema_name=self.tenant.schema_name).invalidate()
+
+        self.assertFalse(contract_helper.check_if_it_is_within_the_validity_period())
+
+    def test_contract_save_does_not_query_the_tenant(self):
+        contract = Contract.objects.select_related("tenant").get(pk=self.contract.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            contract.note = "renewed"
+            contract.save()
+
+        self.assertFalse(
+            [
+                query
+                for query in queries
+                if f'FROM "{Tenant._meta.db_table}"' in query["sql"]
+            ]
+        )
+
+
+class ProvisionJournalTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal = ProvisionJournal(os.path.join(directory.name, "journal"))
+
+    def test_interrupted_rows_are_started_but_not_completed(self):
+        self.journal.start({"subdomain": "a"})
+        self.journal.start({"subdomain": "b"})
+        self.journal.write({"subdomain": "b", "success": True})
+        self.journal.start({"subdomain": "c"})
+        self.journal.write({"subdomain": "c", "success": False})
+        self.journal.start({"subdomain": "d"})
+        self.journal.created(
+            {"subdomain": "d"}, Tenant(id=uuid.UUID(int=1), schema_name="schema_d")
+        )
+
+        self.assertEqual(
+            self.journal.get_started(),
+            {
+                "a": None,
+                "d": {"tenant_id": str(uuid.UUID(int=1)), "schema_name": "schema_d"},
+            },
+        )
+        self.assertEqual(self.journal.get_completed(), {"b"})
+
+    def test_missing_journal_is_empty(self):
+        self.assertEqual(self.journal.get_started(), {})
+        self.assertEqual(self.journal.get_completed(), set())
+
+
+class RecoverTenantTestCase(TenantTestCase):
+    row = {
+        "subdomain": "tenant",
+        "organization_name": "Tenant",
+        "email": "owner@example.com",
+        "password": "password",
+    }
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        # TenantTestCase skips the class level override_settings
+        settings_override = self.settings(DOMAIN_WEBSITE="test.com")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.created = {
+            "tenant_id": str(self.tenant.id),
+            "schema_name": self.tenant.schema_name,
+        }
+
+    def provision(self, created: dict = None) -> dict:
+        # The worker closes its connections, which would end the test transaction
+        with mock.patch("tenant.helpers.provision_helper.connections"):
+            return provision_tenant(self.row, resume=True, created=created)
+
+    def test_completed_tenant_is_recovered(self):
+        User.objects.create(
+            endpoint="dashboard", email="owner@example.com", username="demo"
+        )
+
+        tenant = recover_tenant(self.row, self.created)
+
+        self.assertEqual(tenant.pk, self.tenant.pk)
+
+    def test_unknown_tenant_is_not_recovered(self):
+        created = {"tenant_id": str(uuid.uuid4()), "schema_name": "unknown"}
+
+        self.assertIsNone(recover_tenant(self.row, created))
+        self.assertTrue(Tenant.objects.filter(pk=self.tenant.pk).exists())
+
+    def test_tenant_created_elsewhere_is_never_deleted(self):
+        # The row was interrupted before this run journaled a tenant
+        report = self.provision()
+
+        self.assertFalse(report["success"])
+        self.assertTrue(report["conflict"])
+        self.assertTrue(Tenant.objects.filter(pk=self.tenant.pk).exists())
+
+    def test_resumed_row_reports_the_recovered_tenant(self):
+        User.objects.create(
+            endpoint="dashboard", email="owner@example.com", username="demo"
+        )
+
+        report = self.provision(self.created)
+
+        self.assertTrue(report["success"])
+        self.assertEqual(report["tenant_id"], str(self.tenant.id))
+
+
+class SchemaHelperTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    @mock.patch("tenant.helpers.schema_helper.call_command")
+    def test_create_schema_restores_the_active_schema(self, call_command):
+        schema_helper = SchemaHelper(strategy=STRATEGY_MIGRATE)
+        self.addCleanup(schema_helper.drop_schema, "schema_helper_test")
+
+        schema_helper.create_schema("schema_helper_test")
+
+        self.assertTrue(schema_exists("schema_helper_test"))
+        self.assertEqual(connection.schema_name, self.tenant.schema_name)
+        call_command.assert_called_once()
+
+    @override_settings(
+        TENANT_PROVISIONING={
+            "strategy": STRATEGY_CLONE,
+            "template_schema": "missing_template",
+        }
+    )
+    def test_clone_without_template_raises(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SchemaHelper().create_schema("schema_helper_test")
+
+        self.assertFalse(schema_exists("schema_helper_test"))
+        self.assertEqual(connection.schema_name, self.tenant.schema_name)
+
+
+class TenantPoolTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    @mock.patch("tenant.services.tenant_service.OrganizationService")
+    @mock.patch("tenant.services.tenant_service.SchemaHelper")
+    def test_fill_pool_stops_at_the_size(self, schema_helper, organization_service):
+        PooledSchema.objects.create(schema_name="pooled_existing")
+        tenant_service = TenantService()
+
+        with mock.patch.object(
+            tenant_service, "lock_pool", wraps=tenant_service.lock_pool
+        ) as lock_pool:
+            self.assertEqual(tenant_service.fill_pool(size=2), 1)
+
+        self.assertEqual(tenant_service.fill_pool(size=2), 0)
+        self.assertEqual(PooledSchema.objects.count(), 2)
+        self.assertEqual(lock_pool.call_count, 2)
+        schema_helper.return_value.create_schema.assert_called_once()
+
+    # TenantTestCase skips class level override_settings
+    @override_settings(TENANT_POOL={"enabled": True, "size": 2})
+    def test_claimed_schema_is_returned_after_an_integrity_error(self):
+        schema_name = "pooled_conflict"
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "%s"' % schema_name)
+        self.addCleanup(SchemaHelper().drop_schema, schema_name)
+        PooledSchema.objects.create(schema_name=schema_name)
+        Contract.objects.create(tenant=self.tenant, slug=schema_name)
+
+        # Tenants can only be created from the public schema
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            result, tenant = TenantService().create_tenant(
+                subdomain="conflict", email="conflict@example.com"
+            )
+
+        self.assertFalse(result)
+        self.assertIsNone(tenant)
+        self.assertTrue(PooledSchema.objects.filter(schema_name=schema_name).exists())
+        self.assertTrue(schema_exists(schema_name))
+        self.assertFalse(Tenant.all_objects.filter(schema_name=schema_name).exists())
+
+
+class JobHelperTestCase(TenantTestCase):
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.email = "tenant@example.com"
+
+    def setUp(self):
+        self.handler = mock.Mock()
+        handlers["test-job"] = {"func": self.handler, "tenants": None, "workers": 1}
+        self.addCleanup(handlers.pop, "test-job")
+        self.job = Job.objects.create(slug="test-job", timeout=60)
+
+    def test_expired_lease_is_reclaimed(self):
+        now = timezone.now()
+        task = Task.objects.create(
+            job=self.job,
+            status=STATUS_RUNNING,
+            is_locked=True,
+            attempts=1,
+            locked_until=now - timedelta(seconds=1),
+        )
+
+        tasks = claim_tasks(now, limit=10)
+
+        self.assertEqual([claimed.pk for claimed in tasks], [task.pk])
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 2)
+        self.assertEqual(task.locked_until, now + timedelta(seconds=60))
+
+    def test_live_lease_is_not_reclaimed(self):
+        now = timezone.now()
+        Task.objects.create(
+            job=self.job,
+            status=STATUS_RUNNING,
+            is_locked=True,
+            attempts=1,
+            locked_until=now + timedelta(seconds=60),
+        )
+
+        self.assertEqual(claim_tasks(now, limit=10), [])
+
+    def test_reclaimed_task_is_skipped(self):
+        now = timezone.now()
+        Task.objects.create(job=self.job, scheduled_at=now)
+        (task,) = claim_tasks(now, limit=10)
+        # Another worker reclaims the task after the lease expired
+        Task.objects.filter(pk=task.pk).update(attempts=task.attempts + 1)
+
+        self.assertFalse(run_task(task))
+        self.handler.assert_not_called()
+        task.refresh_from_db()
+        self.assertEqual(task.status, STATUS_RUNNING)
+
+
+class FanOutExecutorTestCase(SimpleTestCase):
+    def test_deadline_stops_the_fan_out(self):
+        job = Job(slug="test-job", timeout=0.2)
+        executor = FanOutExecutor(
+            job, Task(job=job), {"func": None, "tenants": None, "workers": 1}
+        )
+        schema_names = [f"schema_{index}" for index in range(10)]
+
+        def run_schema(schema_name):
+            time.sleep(0.1)
+            return {"schema_name": schema_name, "error": None}
+
+        with mock.patch.object(
+            executor, "get_schema_names", return_value=iter(schema_names)
+        ), mock.patch.object(
+            executor, "run_schema", side_effect=run_schema
+        ) as run_schema_mock, mock.patch.object(
+            executor, "save_result"
+        ):
+            started_at = time.monotonic()
+            with self.assertRaises(JobTimeout):
+                executor.run()
+
+        self.assertLess(time.monotonic() - started_at, 0.5)
+        self.assertLess(run_schema_mock.call_count, len(schema_names))